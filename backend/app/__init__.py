@@ -1,7 +1,16 @@
 from config import Config
-from flask import Flask, request, redirect, url_for, current_app
-from app.database.models import db, User
-from flask_session import Session
+from flask import Flask, request, redirect, url_for, current_app, jsonify
+from app.database.models import db
+from app.database.engine import init_engine
+from app.database.pool import pool_metrics
+from app.services.champion_store import champion_store
+from app.services.blocked_ips import blocked_ips
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
+from app.services.sessions import init_sessions
+
+# importing the storage registers the `sqlite://` scheme for the limiter
+from app.services.sqlite_storage import SQLiteStorage
 from flask_migrate import Migrate
 from flask_login.login_manager import LoginManager
 from flask_talisman import Talisman
@@ -10,14 +19,10 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from datetime import timedelta, datetime, timezone
 
-# memory cache for blocked ips
-blocked_ips = {}
-
-# limiter configuration
+# limiter configuration (storage from RATELIMIT_STORAGE_URI)
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per hour", "50 per minute"],
-    storage_uri="memory://",
     headers_enabled=True,
 )
 
@@ -33,31 +38,39 @@ def create_app():
     login_manager.login_view = "auth.login"
     login_manager.login_message = "Please log in to access this page."
 
-    # User loader managed by login manager (flask_login)
+    # User loader managed by login manager (flask_login), cached per process
+    user_cache.init_app(app)
+
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return user_cache.load(int(user_id))
 
-    # Database initialization + migrations
-    db.init_app(app)
+    # Database initialization (engine options from DB_PROFILE) + migrations
+    init_engine(app, db)
     Migrate(app, db)
 
-    # Adding db to SQLALCHEMY Session
-    app.config["SESSION_SQLALCHEMY"] = db
+    # Session initialization (backend from SESSION_BACKEND)
+    init_sessions(app, db)
 
-    # Session initialization
-    Session(app)
+    # Password hashing off the request thread
+    password_hasher.init_app(app)
 
-    # Limiter initialization
+    # Limiter initialization + shared ban list
     limiter.init_app(app)
+    blocked_ips.init_app(app)
 
     # Error handlers for limiter
     @app.errorhandler(429)
     def ratelimit_handler(e):
+        # read-only JSON API: own limit, no ban (`Retry-After` added by the limiter)
+        if request.blueprint == "champions":
+            return jsonify(error="Too many requests.", limit=e.description), 429
+
         ip = request.headers.get("X-Forwarded-For") or get_remote_address()
-        blocked_ips[ip] = datetime.now(timezone.utc) + timedelta(minutes=1)
+        unblock_time = datetime.now(timezone.utc) + timedelta(minutes=1)
+        blocked_ips.block(ip, unblock_time)
         current_app.logger.warning(
-            f"⚠️  Rate limit exceeded for IP: {ip} until {blocked_ips[ip]}"
+            f"⚠️  Rate limit exceeded for IP: {ip} until {unblock_time}"
         )
 
         return redirect(url_for("auth.block"))
@@ -65,13 +78,45 @@ def create_app():
     # Force block ip addresses
     @app.before_request
     def check_block_ip():
+        # the read-only JSON API is not subject to bans
+        if request.blueprint == "champions":
+            return
+
         ip = request.headers.get("X-Forwarded-For") or get_remote_address()
-        unblock_time = blocked_ips.get(ip)
-        if unblock_time and unblock_time > datetime.now(timezone.utc):
-            if request.endpoint not in ("auth.block", "static"):
-                return redirect(url_for("auth.block"))
-        elif unblock_time and unblock_time <= datetime.now(timezone.utc):
-            blocked_ips.pop(ip, None)
+        # expired bans are removed by the ban list itself
+        if blocked_ips.get(ip) and request.endpoint not in (
+            "auth.block",
+            "static",
+            "health",
+        ):
+            return redirect(url_for("auth.block"))
+
+    # Health check for monitoring: size and evictions of the ban list
+    @app.route("/health")
+    @limiter.exempt
+    def health():
+        return jsonify(
+            status="ok",
+            ban_list=blocked_ips.metrics(),
+            db_pool=pool_metrics.snapshot(),
+        )
+
+    # Mail outbox worker: `flask mail_worker` or a thread of the server
+    from app.services.mail_sender import mail_worker_command, start_mail_thread
+
+    app.cli.add_command(mail_worker_command)
+    if app.config["MAIL_WORKER_THREAD"]:
+        start_mail_thread(app)
+
+    # Expired tokens and sessions: `flask maintenance` or a thread of the server
+    from app.services.maintenance import maintenance_command, start_maintenance_thread
+
+    app.cli.add_command(maintenance_command)
+    if app.config["MAINTENANCE_INTERVAL"]:
+        start_maintenance_thread(app)
+
+    # Champion data loaded once in memory
+    champion_store.init_app(app)
 
     # Talisman
     # Configuring Content Security Policy to serve CDN Framework like Bootstrap
@@ -97,4 +142,8 @@ def create_app():
 
     app.register_blueprint(dashboard_bp)
 
+    from app.blueprints.champions.routes import champions_bp
+
+    app.register_blueprint(champions_bp)
+
     return app
@@ -16,10 +16,13 @@ from app.blueprints.auth.forms import (
     NewPasswordForm,
 )
 from app.database.crud_operations import UserCRUD, EmailTokenCRUD
-from werkzeug.security import check_password_hash
-from app.services.mail_sender import sendmail
+from app.database.models import db
+from app.database.unit_of_work import unit_of_work
+from app.services.password_hasher import password_hasher, HashingBusy
+from app.services.mail_sender import queue_mail
 from datetime import datetime, timezone, timedelta
-from app import limiter, blocked_ips
+from app import limiter
+from app.services.blocked_ips import blocked_ips
 from flask_limiter.util import get_remote_address
 
 # Register blueprint
@@ -57,6 +60,7 @@ def register():
 
             # load into session
             session["user_id"] = user_obj.id
+            session.permanent = current_app.config["SESSION_PERMANENT"]
 
             # log user and redirect into protected route
             login_user(user_obj)
@@ -87,12 +91,29 @@ def login():
             flash("User not found.", "warning")
             return render_template("login.html", form=form)
 
-        if not check_password_hash(user_obj.hash_pwd, form.password.data):
+        try:
+            valid = password_hasher.verify(user_obj.hash_pwd, form.password.data)
+        except HashingBusy as e:
+            current_app.logger.warning(f"⚠️  Password hashing busy: {e}.")
+            flash("Server busy, please try again.", "warning")
+            return render_template("login.html", form=form), 503
+
+        if not valid:
             flash("Invalid Credentials.", "danger")
             return render_template("login.html", form=form)
 
+        # upgrade hashes made with old cost parameters, without failing the login
+        if password_hasher.needs_rehash(user_obj.hash_pwd):
+            try:
+                user_crud.update_password(
+                    user_id=user_obj.id, password=form.password.data
+                )
+            except Exception as e:
+                current_app.logger.error(f"❗  Error upgrading password hash: {e}")
+
         # load into session
         session["user_id"] = user_obj.id
+        session.permanent = current_app.config["SESSION_PERMANENT"]
 
         # log user and redirect into protected route
         login_user(user_obj, remember=form.remember.data)
@@ -129,17 +150,20 @@ def reset_password_request():
             return render_template("reset_password_request.html", form=form)
 
         try:
-            email_token_obj = email_token_crud.create(user_id=user_obj.id)
-
-            server_url = url_for(
-                "auth.reset_password", token=email_token_obj.token, _external=True
-            )
-            if not sendmail(
-                email=user_obj.email,
-                subject="Reset Password",
-                content=f"To reset your password, click the link below:\n\n{server_url}",
-            ):
-
+            # token and queued mail are stored together or not at all
+            with unit_of_work(db, "reset_password_request"):
+                email_token_obj = email_token_crud.create(user_id=user_obj.id)
+
+                server_url = url_for(
+                    "auth.reset_password", token=email_token_obj.token, _external=True
+                )
+                queued = queue_mail(
+                    email=user_obj.email,
+                    subject="Reset Password",
+                    content=f"To reset your password, click the link below:\n\n{server_url}",
+                )
+
+            if not queued:
                 flash("Error sending email.", "danger")
                 return render_template("reset_password_request.html", form=form)
 
@@ -175,10 +199,12 @@ def reset_password(token):
 
     if form.validate_on_submit():
         try:
-            user_crud.update_password(
-                user_id=token_obj.user_id, password=form.password.data
-            )
-            crud_email_token.validate_token(user_id=token_obj.user_id)
+            # password change and token consumption in a single transaction
+            with unit_of_work(db, "reset_password"):
+                user_crud.update_password(
+                    user_id=token_obj.user_id, password=form.password.data
+                )
+                crud_email_token.validate_token(token=token)
             flash("Password updated successfully.", "success")
             return redirect(url_for("auth.login"))
 
@@ -0,0 +1,113 @@
+from flask import Blueprint, Response, request, current_app, jsonify
+from app import limiter
+from app.services.champion_store import champion_store, ENCODINGS
+
+# Register blueprint
+champions_bp = Blueprint(
+    name="champions",
+    import_name=__name__,
+    url_prefix="/api",
+)
+
+# Own limit instead of the default ones (a 429 answers JSON, without banning the IP)
+limiter.limit(lambda: current_app.config["CHAMPIONS_API_RATE_LIMIT"])(champions_bp)
+
+
+def negotiate_encoding():
+    """
+    Return the best precompressed encoding accepted by the client, or `identity`.
+    """
+
+    accepted = request.accept_encodings
+    encoding = max(ENCODINGS, key=lambda name: accepted[name], default=None)
+    if encoding and accepted[encoding] > 0:
+        return encoding
+    return "identity"
+
+
+def send_payload(payload):
+    """
+    Build the response for a payload, answering `304` when the client copy is still valid.
+    """
+
+    encoding = negotiate_encoding()
+    etag = payload.etag(encoding)
+
+    # any representation of the same content validates the cached copy
+    if request.if_none_match and any(
+        request.if_none_match.contains(payload.etag(name))
+        for name in (*ENCODINGS, "identity")
+    ):
+        response = Response(status=304)
+    else:
+        response = Response(payload.body(encoding), mimetype="application/json")
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = (
+        f"public, max-age={current_app.config['CHAMPIONS_CACHE_MAX_AGE']}"
+    )
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def not_found(message):
+    return jsonify(error=message), 404
+
+
+@champions_bp.route("/champions")
+@champions_bp.route("/<locale>/champions")
+def champions(locale=None):
+    snapshot = champion_store.get(locale)
+    if not snapshot:
+        return not_found("Locale not found.")
+
+    return send_payload(snapshot.champions)
+
+
+@champions_bp.route("/champions/<champ_id>")
+@champions_bp.route("/<locale>/champions/<champ_id>")
+def champion(champ_id, locale=None):
+    snapshot = champion_store.get(locale)
+    if not snapshot:
+        return not_found("Locale not found.")
+
+    payload = snapshot.get(champ_id)
+    if not payload:
+        return not_found("Champion not found.")
+
+    return send_payload(payload)
+
+
+@champions_bp.route("/search")
+@champions_bp.route("/<locale>/search")
+def search(locale=None):
+    snapshot = champion_store.get(locale or request.args.get("locale"))
+    if not snapshot:
+        return not_found("Locale not found.")
+    if not snapshot.search:
+        return not_found("Search index not available.")
+
+    query = request.args.get("q", "")[: current_app.config["SEARCH_MAX_QUERY_LENGTH"]]
+    limit = min(
+        request.args.get("limit", 10, type=int),
+        current_app.config["SEARCH_MAX_RESULTS"],
+    )
+
+    results = snapshot.search.search(query, limit)
+    return jsonify(
+        query=query,
+        locale=snapshot.locale,
+        results=[
+            {"id": champ_id, "name": name, "score": score}
+            for champ_id, name, score in results
+        ],
+    )
+
+
+@champions_bp.route("/locales")
+def locales():
+    return jsonify(
+        default=champion_store.default_locale, locales=champion_store.locales
+    )
@@ -1,7 +1,16 @@
-from app.database.models import db, User, EmailToken
+from app.database.models import db, User, EmailToken, MailMessage
 from app.utils.decorators import db_commiter
-from werkzeug.security import generate_password_hash
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import invalidates_user
 from secrets import token_urlsafe
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import update
+
+
+# Databases supporting `SELECT ... FOR UPDATE SKIP LOCKED`
+SKIP_LOCKED_DIALECTS = ("postgresql", "mysql", "mariadb", "oracle")
+# Reads of due messages when all the candidates were claimed by other workers meanwhile
+CLAIM_ATTEMPTS = 3
 
 
 class UserCRUD:
@@ -19,7 +28,7 @@ class UserCRUD:
         Create a new user.
         """
         user = self._user_model(
-            username=username, email=email, hash_pwd=generate_password_hash(password)
+            username=username, email=email, hash_pwd=password_hasher.hash(password)
         )
         self.session.add(user)
         return user
@@ -36,6 +45,7 @@ class UserCRUD:
         """
         return self._user_model.query.filter_by(email=email).first()
 
+    @invalidates_user
     @db_commiter(db)
     def update(self, user_id: int, **kwargs) -> User:
         """
@@ -47,15 +57,17 @@ class UserCRUD:
             setattr(user, key, value)
         return user
 
+    @invalidates_user
     @db_commiter(db)
     def update_password(self, user_id: int, password: str) -> User:
         """
         Update a user password by id.
         """
         user = self.get_by_id(user_id)
-        setattr(user, "hash_pwd", generate_password_hash(password))
+        setattr(user, "hash_pwd", password_hasher.hash(password))
         return user
 
+    @invalidates_user
     @db_commiter(db)
     def delete(self, user_id: int) -> None:
         """
@@ -80,29 +92,44 @@ class EmailTokenCRUD(UserCRUD):
         """
         Create a new email token.
         """
-        email_token = self._email_token_model(user_id=user_id, token=token_urlsafe(32))
+        token = token_urlsafe(32)
+        email_token = self._email_token_model(
+            user_id=user_id, token_digest=self._email_token_model.digest(token)
+        )
+        # the plain token is available only on the created object, to build the link
+        email_token.token = token
         self.session.add(email_token)
         return email_token
 
     def get_by_id(self, user_id: int) -> EmailToken:
         """
-        Get a email token by user_id.
-        """
-        return self._email_token_model.query.filter_by(user_id=user_id).first()
+        Get the most recent unused, unexpired email token of a user_id.
+        """
+        model = self._email_token_model
+        return (
+            model.query.filter(
+                model.user_id == user_id,
+                model.used.is_(False),
+                model.expires_at > datetime.now(timezone.utc),
+            )
+            .order_by(model.expires_at.desc())
+            .first()
+        )
 
     def get_by_token(self, token: str) -> EmailToken:
         """
-        Get a email token by token.
+        Get a email token by token (unique index on its digest).
         """
-        return self._email_token_model.query.filter_by(token=token).first()
+        return self._email_token_model.query.filter_by(
+            token_digest=self._email_token_model.digest(token)
+        ).first()
 
-    db_commiter(db)
-
-    def validate_token(self, user_id: int) -> EmailToken:
+    @db_commiter(db)
+    def validate_token(self, token: str) -> EmailToken:
         """
-        Update a email token by user_id.
+        Mark an email token as used.
         """
-        email_token = self.get_by_id(user_id)
+        email_token = self.get_by_token(token)
         setattr(email_token, "used", True)
         return email_token
 
@@ -113,3 +140,102 @@ class EmailTokenCRUD(UserCRUD):
         """
         email_token = self.get_by_id(user_id)
         self.session.delete(email_token)
+
+
+# CRUD operations for the mail outbox
+class MailOutboxCRUD:
+    """
+    CRUD operations for the outgoing mail queue.
+    """
+
+    def __init__(self):
+        self._mail_model = MailMessage
+        self.session = db.session
+
+    @db_commiter(db)
+    def enqueue(self, recipient: str, subject: str, content: str) -> MailMessage:
+        """
+        Add a message to the outbox, it is sent by the mail worker.
+        """
+        message = self._mail_model(
+            recipient=recipient, subject=subject, content=content
+        )
+        self.session.add(message)
+        return message
+
+    @db_commiter(db)
+    def claim(self, limit: int, lease: timedelta) -> list[MailMessage]:
+        """
+        Get up to `limit` messages due for sending and hide them from other workers for `lease`.
+
+        Each message is claimed by a single worker: with row locks (`SKIP LOCKED`) where the
+        database supports them, otherwise by moving its lease only if no other worker did.
+        """
+        model = self._mail_model
+        now = datetime.now(timezone.utc)
+        query = (
+            model.query.filter(model.status == "pending", model.next_attempt_at <= now)
+            .order_by(model.next_attempt_at)
+            .limit(limit)
+            # the compare-and-set needs the current lease, not the one already in the session
+            .populate_existing()
+        )
+
+        if self.session.get_bind().dialect.name in SKIP_LOCKED_DIALECTS:
+            messages = query.with_for_update(skip_locked=True).all()
+            for message in messages:
+                message.next_attempt_at = now + lease
+            return messages
+
+        # candidates already taken by other workers are skipped, then a new set is read
+        claimed = []
+        for _ in range(CLAIM_ATTEMPTS):
+            candidates = query.all()
+            for message in candidates:
+                result = self.session.execute(
+                    update(model)
+                    .where(
+                        model.id == message.id,
+                        model.status == "pending",
+                        model.next_attempt_at == message.next_attempt_at,
+                    )
+                    .values(next_attempt_at=now + lease)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    claimed.append(message)
+
+            if claimed or not candidates:
+                break
+
+        # the claimed rows are reloaded with the new lease
+        for message in claimed:
+            self.session.expire(message, ["next_attempt_at"])
+        return claimed
+
+    @db_commiter(db)
+    def mark_sent(self, messages: list[MailMessage]) -> None:
+        """
+        Mark messages as sent.
+        """
+        now = datetime.now(timezone.utc)
+        for message in messages:
+            message.status = "sent"
+            message.attempts += 1
+            message.sent_at = now
+            message.last_error = None
+
+    @db_commiter(db)
+    def mark_failed(
+        self, message: MailMessage, error: str, delay: timedelta, max_attempts: int
+    ) -> MailMessage:
+        """
+        Schedule a new attempt after `delay`, or give up after `max_attempts`.
+        """
+        message.attempts += 1
+        message.last_error = error[:1000]
+        if message.attempts >= max_attempts:
+            message.status = "failed"
+        else:
+            message.next_attempt_at = datetime.now(timezone.utc) + delay
+        return message
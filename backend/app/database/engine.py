@@ -0,0 +1,57 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app.database.pool import TimedQueuePool, pool_metrics
+
+
+def engine_options(app):
+    """
+    Return the engine options of the `DB_PROFILE` profile for the configured database.
+    """
+
+    options = dict(app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+    if "pool_size" in options:
+        options["poolclass"] = TimedQueuePool
+
+    # PostgreSQL: the timeout is a startup option of the connection, a `SET` would be
+    # undone by the rollback of the pool when the first connection is returned
+    timeout = app.config["DB_STATEMENT_TIMEOUT_MS"]
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if timeout and uri and make_url(uri).get_backend_name() == "postgresql":
+        connect_args = options.get("connect_args", {})
+        startup = (
+            f"{connect_args.get('options', '')} -c statement_timeout={int(timeout)}"
+        )
+        options["connect_args"] = {**connect_args, "options": startup.strip()}
+
+    return options
+
+
+def init_engine(app, db):
+    """
+    Initialize `db` with the engine options of the `DB_PROFILE` profile.
+
+    Pooled profiles use `TimedQueuePool` (checkout metrics in `pool_metrics`); every new
+    connection gets the SQLite pragmas or the statement timeout of its database.
+    """
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app)
+    pool_metrics.slow_checkout = app.config["DB_POOL_SLOW_CHECKOUT"]
+
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+        pragmas = app.config["SQLITE_PRAGMAS"]
+        timeout = app.config["DB_STATEMENT_TIMEOUT_MS"]
+
+        @event.listens_for(engine, "connect")
+        def configure_connection(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            if engine.dialect.name == "sqlite":
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            elif engine.dialect.name == "mysql" and timeout:
+                # session variables are not reset by a rollback
+                cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(timeout)}")
+            cursor.close()
@@ -1,8 +1,9 @@
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from datetime import datetime, timezone, timedelta
+from hashlib import sha256
 
 db = SQLAlchemy()
 
@@ -40,15 +41,24 @@ class User(db.Model, UserMixin):
 class EmailToken(db.Model):
 
     __tablename__ = "email_tokens"
+    __table_args__ = (
+        # active tokens of a user: user_id = ? AND used = ? AND expires_at > ?
+        Index(
+            "ix_email_tokens_user_id_used_expires_at", "user_id", "used", "expires_at"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=False
     )
-    token: Mapped[str] = mapped_column(String(255), nullable=False)
+    # only the SHA-256 of the token is stored, the token itself is sent by email
+    token_digest: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
     used: Mapped[bool] = mapped_column(Boolean, default=False)
     expires_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc) + timedelta(hours=1)
+        DateTime,
+        default=lambda: datetime.now(timezone.utc) + timedelta(hours=1),
+        index=True,
     )
 
     user = relationship("User", back_populates="email_tokens")
@@ -56,10 +66,50 @@ class EmailToken(db.Model):
     def __repr__(self):
         return f"<EmailToken {self.email}>"
 
+    @staticmethod
+    def digest(token: str) -> str:
+        return sha256(token.encode("utf-8")).hexdigest()
+
     def to_dict(self):
         return {
             "id": self.id,
-            "token": self.token,
-            "is_used": self.is_used,
+            "token_digest": self.token_digest,
+            "is_used": self.used,
             "expires_at": self.expires_at,
         }
+
+
+class MailMessage(db.Model):
+
+    __tablename__ = "mail_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    recipient: Mapped[str] = mapped_column(String(100), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(10), default="pending", nullable=False, index=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc), index=True
+    )
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+    sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<MailMessage {self.id} {self.status}>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "recipient": self.recipient,
+            "subject": self.subject,
+            "status": self.status,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at,
+            "sent_at": self.sent_at,
+        }
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Checkout statistics of the connection pools of the process.
+
+    `wait` is the time spent in `pool.connect()`: waiting for a free connection, opening an
+    overflow one and the pre-ping. `saturation` is checked out / (size + max overflow).
+    """
+
+    def __init__(self, slow_checkout=0.1):
+        self.slow_checkout = slow_checkout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.slow_checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.saturation = 0.0
+            self.max_saturation = 0.0
+
+    def record(self, wait, checked_out, capacity, timeout=False):
+        saturation = checked_out / capacity if capacity else 0.0
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+            if wait >= self.slow_checkout:
+                self.slow_checkouts += 1
+            self.max_wait = max(self.max_wait, wait)
+            self.saturation = saturation
+            self.max_saturation = max(self.max_saturation, saturation)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "avg_wait_ms": (
+                    1000 * self.total_wait / self.checkouts if self.checkouts else 0.0
+                ),
+                "max_wait_ms": 1000 * self.max_wait,
+                "saturation": self.saturation,
+                "max_saturation": self.max_saturation,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """
+    `QueuePool` recording checkout wait time and saturation in `pool_metrics`.
+    """
+
+    def _capacity(self):
+        # max_overflow = -1: no limit
+        return None if self._max_overflow < 0 else self.size() + self._max_overflow
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record(
+                time.perf_counter() - started,
+                self.checkedout(),
+                self._capacity(),
+                timeout=True,
+            )
+            raise
+
+        pool_metrics.record(
+            time.perf_counter() - started, self.checkedout(), self._capacity()
+        )
+        return connection
+
+
+# SQLAlchemy names the pool logger after this module: a child of the Flask `app` logger,
+# which would print every checkout in debug mode
+logging.getLogger(f"{__name__}.{TimedQueuePool.__name__}").setLevel(logging.WARNING)
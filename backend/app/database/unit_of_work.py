@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+from flask import current_app
+
+
+DEPTH_KEY = "unit_of_work_depth"
+CALLBACKS_KEY = "unit_of_work_after_commit"
+
+
+def in_unit_of_work(session):
+    return session.info.get(DEPTH_KEY, 0) > 0
+
+
+def after_commit(session, callback):
+    """
+    Run `callback` once the current unit of work commits (immediately outside of one).
+    """
+
+    if in_unit_of_work(session):
+        session.info.setdefault(CALLBACKS_KEY, []).append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def unit_of_work(db, name="unit of work"):
+    """
+    Group several CRUD operations in a single transaction.
+
+    Inside the block `db_commiter` only flushes: the outermost block commits once at the end
+    (logging the commit latency) or rolls everything back on error. Nested blocks are
+    savepoints, rolled back on their own without losing the outer work.
+    """
+
+    session = db.session
+    depth = session.info.get(DEPTH_KEY, 0)
+
+    if depth:
+        savepoint = session.begin_nested()
+        session.info[DEPTH_KEY] = depth + 1
+        try:
+            yield session
+            savepoint.commit()
+        except Exception:
+            savepoint.rollback()
+            raise
+        finally:
+            session.info[DEPTH_KEY] = depth
+        return
+
+    session.info[DEPTH_KEY] = 1
+    try:
+        yield session
+        session.flush()
+        started = perf_counter()
+        session.commit()
+        current_app.logger.info(
+            f"✅  {name} commited in {(perf_counter() - started) * 1000:.1f} ms."
+        )
+    except Exception as e:
+        session.rollback()
+        session.info.pop(CALLBACKS_KEY, None)
+        current_app.logger.error(f"⚠️  {name} failed to commit: {e}")
+        raise
+    finally:
+        session.info[DEPTH_KEY] = 0
+
+    for callback in session.info.pop(CALLBACKS_KEY, []):
+        callback()
@@ -0,0 +1,104 @@
+import heapq
+import threading
+import time
+
+
+class BanTable:
+    """
+    Bounded in-memory table of banned IPs with O(1) lookup.
+
+    A min-heap ordered by ban end removes every expired entry in bulk at each access,
+    so entries no longer depend on the same IP coming back to be deleted.
+    When `capacity` is reached the ban closest to its end is evicted.
+    """
+
+    def __init__(self, capacity=100_000):
+        if capacity < 1:
+            raise ValueError("Ban table capacity must be positive")
+
+        self.capacity = capacity
+        self.evictions = 0
+        self.expired = 0
+
+        self._until = {}
+        # (until, ip) pairs; entries replaced or unblocked stay until popped or compacted
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._until)
+
+    def __contains__(self, ip):
+        return self.get(ip) is not None
+
+    def _purge(self, now):
+        heap, until = self._heap, self._until
+        while heap and heap[0][0] <= now:
+            end, ip = heapq.heappop(heap)
+            if until.get(ip) == end:
+                del until[ip]
+                self.expired += 1
+
+    def _evict(self):
+        heap, until = self._heap, self._until
+        while heap:
+            end, ip = heapq.heappop(heap)
+            if until.get(ip) == end:
+                del until[ip]
+                self.evictions += 1
+                return
+
+    def _compact(self):
+        self._heap = [(end, ip) for ip, end in self._until.items()]
+        heapq.heapify(self._heap)
+
+    def block(self, ip, until, now=None):
+        """
+        Ban `ip` until the `until` timestamp (seconds since the epoch).
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            self._purge(now)
+
+            if ip not in self._until and len(self._until) >= self.capacity:
+                self._evict()
+
+            self._until[ip] = until
+            heapq.heappush(self._heap, (until, ip))
+
+            # stale pairs left by re-bans and unblocks
+            if len(self._heap) > 2 * len(self._until) + 64:
+                self._compact()
+
+    def unblock(self, ip):
+        with self._lock:
+            self._until.pop(ip, None)
+
+    def get(self, ip, now=None):
+        """
+        Return the end of the ban of `ip`, or `None` if it is not blocked.
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            self._purge(now)
+            return self._until.get(ip)
+
+    def purge(self, now=None):
+        """
+        Remove the expired bans and return how many are left.
+        """
+
+        with self._lock:
+            self._purge(time.time() if now is None else now)
+            return len(self._until)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "size": len(self._until),
+                "capacity": self.capacity,
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
@@ -0,0 +1,162 @@
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import redis
+
+from app.services.ban_table import BanTable
+from app.services.sqlite_storage import SQLiteConnections, sqlite_path
+
+
+class MemoryBanStore:
+    """
+    Bans kept in the process memory, in a bounded table: only for a single worker.
+    """
+
+    def __init__(self, uri=None, capacity=100_000):
+        self._table = BanTable(capacity)
+
+    def block(self, ip, until):
+        self._table.block(ip, until.timestamp())
+
+    def unblock(self, ip):
+        self._table.unblock(ip)
+
+    def get(self, ip):
+        until = self._table.get(ip)
+        return datetime.fromtimestamp(until, timezone.utc) if until else None
+
+    def metrics(self):
+        return self._table.metrics()
+
+
+class SQLiteBanStore:
+    """
+    Bans in a SQLite database shared by the workers of a single host.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blocked_ips (
+            ip TEXT PRIMARY KEY,
+            until REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_blocked_ips_until ON blocked_ips (until);
+    """
+
+    def __init__(self, uri, **options):
+        self._connections = SQLiteConnections(sqlite_path(uri), self.SCHEMA)
+
+    def block(self, ip, until):
+        connection = self._connections.get()
+        # expired bans are removed in bulk, not only when the same IP comes back
+        connection.execute(
+            "DELETE FROM blocked_ips WHERE until <= ?",
+            (datetime.now(timezone.utc).timestamp(),),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO blocked_ips (ip, until) VALUES (?, ?)",
+            (ip, until.timestamp()),
+        )
+
+    def unblock(self, ip):
+        self._connections.get().execute("DELETE FROM blocked_ips WHERE ip = ?", (ip,))
+
+    def get(self, ip):
+        row = (
+            self._connections.get()
+            .execute("SELECT until FROM blocked_ips WHERE ip = ?", (ip,))
+            .fetchone()
+        )
+        return datetime.fromtimestamp(row[0], timezone.utc) if row else None
+
+    def metrics(self):
+        (size,) = (
+            self._connections.get()
+            .execute(
+                "SELECT COUNT(*) FROM blocked_ips WHERE until > ?",
+                (datetime.now(timezone.utc).timestamp(),),
+            )
+            .fetchone()
+        )
+        return {"size": size}
+
+
+class RedisBanStore:
+    """
+    Bans in Redis, shared by every worker and host; keys expire together with the ban.
+    """
+
+    PREFIX = "blocked_ip:"
+
+    def __init__(self, uri, **options):
+        self._client = redis.Redis.from_url(uri)
+
+    def block(self, ip, until):
+        ttl = max(1, int((until - datetime.now(timezone.utc)).total_seconds() * 1000))
+        self._client.set(f"{self.PREFIX}{ip}", until.timestamp(), px=ttl)
+
+    def unblock(self, ip):
+        self._client.delete(f"{self.PREFIX}{ip}")
+
+    def get(self, ip):
+        value = self._client.get(f"{self.PREFIX}{ip}")
+        return datetime.fromtimestamp(float(value), timezone.utc) if value else None
+
+    def metrics(self):
+        return {"size": sum(1 for _ in self._client.scan_iter(f"{self.PREFIX}*"))}
+
+
+BACKENDS = {
+    "memory": MemoryBanStore,
+    "sqlite": SQLiteBanStore,
+    "redis": RedisBanStore,
+    "rediss": RedisBanStore,
+}
+
+
+class BlockedIPs:
+    """
+    Ban list of the IP addresses that exceeded a rate limit.
+
+    The backend is chosen by `BAN_STORAGE_URI` (by default the same storage of the limiter):
+    `memory://`, `sqlite:///<path>` or `redis://host:port/db`.
+    """
+
+    def __init__(self):
+        self._store = MemoryBanStore()
+
+    def init_app(self, app):
+        uri = app.config["BAN_STORAGE_URI"]
+        scheme = urlparse(uri).scheme
+
+        if scheme not in BACKENDS:
+            raise ValueError(f"Unknown ban storage scheme: {uri}")
+
+        self._store = BACKENDS[scheme](uri, capacity=app.config["BAN_TABLE_CAPACITY"])
+        app.extensions["blocked_ips"] = self
+
+    def block(self, ip, until):
+        self._store.block(ip, until)
+
+    def unblock(self, ip):
+        self._store.unblock(ip)
+
+    def get(self, ip):
+        """
+        Return the end of the ban of `ip`, or `None` if it is not blocked anymore.
+        """
+
+        until = self._store.get(ip)
+        if until and until <= datetime.now(timezone.utc):
+            self._store.unblock(ip)
+            return None
+        return until
+
+    def metrics(self):
+        """
+        Size of the ban list, plus evictions and expired bans for the in-memory table.
+        """
+
+        return self._store.metrics()
+
+
+blocked_ips = BlockedIPs()
@@ -0,0 +1,9 @@
+from app.services.scripting_modules import load_scripting_module
+
+
+# The pack format (writer, reader and `VERSION` in the header) is defined once in
+# `scripting/packing.py`: the backend loads that module instead of keeping a copy of the reader.
+packing = load_scripting_module("packing")
+
+# Memory-mapped champion pack: `get` decodes a single record and the strings it references
+ChampionPack = packing.PackReader
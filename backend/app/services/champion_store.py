@@ -0,0 +1,271 @@
+from dataclasses import dataclass, field
+from hashlib import sha256
+from json import loads, dumps
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Mapping
+import gzip
+
+import brotli
+
+from app.services.search_index import SearchIndex
+from app.services.champion_pack import ChampionPack
+
+
+# Encodings served from precompressed bodies, in order of preference
+ENCODINGS = ("br", "gzip")
+
+
+@dataclass(frozen=True)
+class Payload:
+    """
+    Pre-serialized JSON body with its precompressed variants and strong ETag.
+    """
+
+    identity: bytes
+    gzip: bytes
+    br: bytes
+    digest: str
+
+    @classmethod
+    def build(cls, data, brotli_quality=9):
+        body = dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return cls(
+            identity=body,
+            gzip=gzip.compress(body, compresslevel=6, mtime=0),
+            br=brotli.compress(body, mode=brotli.MODE_TEXT, quality=brotli_quality),
+            digest=sha256(body).hexdigest()[:32],
+        )
+
+    def body(self, encoding):
+        return getattr(self, encoding) if encoding in ENCODINGS else self.identity
+
+    def etag(self, encoding):
+        # every representation needs its own strong validator
+        return f"{self.digest}-{encoding}" if encoding in ENCODINGS else self.digest
+
+
+@dataclass(frozen=True)
+class LocaleSnapshot:
+    """
+    Immutable view of a `<locale>_data.pack` or `<locale>_data.json` file (and its
+    `<locale>_search.json` index, if generated), replaced as a whole on reload.
+
+    Payloads are built on first request and kept for the lifetime of the snapshot.
+    """
+
+    locale: str
+    path: Path
+    # (mtime, size) of the data and search index files, to detect changes
+    signature: tuple
+    # champion id -> data: a `ChampionPack` or the parsed JSON
+    source: Mapping
+    # casefolded id -> id, to accept `aatrox` as well as `Aatrox`
+    aliases: Mapping[str, str]
+    search: SearchIndex | None
+    brotli_quality: int = 9
+    _payloads: dict = field(default_factory=dict, repr=False, compare=False)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def _payload(self, champ_id):
+        payload = self._payloads.get(champ_id)
+        if payload is None:
+            with self._lock:
+                payload = self._payloads.get(champ_id)
+                if payload is None:
+                    data = (
+                        self.source.get(champ_id)
+                        if champ_id
+                        else {key: self.source.get(key) for key in self.source.keys()}
+                    )
+                    payload = Payload.build(data, self.brotli_quality)
+                    self._payloads[champ_id] = payload
+        return payload
+
+    @property
+    def champions(self):
+        return self._payload(None)
+
+    def get(self, champ_id):
+        champ_id = (
+            champ_id
+            if champ_id in self.source
+            else self.aliases.get(champ_id.casefold())
+        )
+        return self._payload(champ_id) if champ_id else None
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+class ChampionStore:
+    """
+    In-memory store of the champion data generated by the scripting module.
+
+    Locales are read from the compact `<locale>_data.pack` files when available and up to date
+    (memory-mapped, opened without decoding the champions), otherwise from `<locale>_data.json`.
+    Responses are kept as pre-serialized, precompressed payloads, so repeated requests
+    never touch the JSON encoder.
+    Files are checked for changes at most every `CHAMPIONS_RELOAD_INTERVAL` seconds:
+    changed locales are rebuilt and swapped in, removed ones are dropped.
+    """
+
+    SUFFIXES = ("_data.pack", "_data.json")
+    SEARCH_SUFFIX = "_search.json"
+
+    def __init__(self):
+        self._snapshots: Mapping[str, LocaleSnapshot] = MappingProxyType({})
+        self._lock = Lock()
+        self._checked_at = 0.0
+        # path -> signature of the files that failed to load, not retried until they change
+        self._failed = {}
+        self.data_dir = None
+        self.configured_locale = None
+        self.default_locale = None
+        self.reload_interval = 0
+        self.brotli_quality = 9
+        self.logger = None
+
+    def init_app(self, app):
+        self.data_dir = Path(app.config["CHAMPIONS_DATA_DIR"])
+        self.configured_locale = app.config["CHAMPIONS_DEFAULT_LOCALE"]
+        self.default_locale = self.configured_locale
+        self.reload_interval = app.config["CHAMPIONS_RELOAD_INTERVAL"]
+        self.brotli_quality = app.config["CHAMPIONS_BROTLI_QUALITY"]
+        self.logger = app.logger
+
+        app.extensions["champion_store"] = self
+        self.refresh(force=True)
+
+    @property
+    def locales(self):
+        return tuple(self._snapshots)
+
+    def _signature(self, path, search_path):
+        stat = path.stat()
+        search_stat = search_path.stat() if search_path.exists() else None
+        return (
+            stat.st_mtime_ns,
+            stat.st_size,
+            search_stat and search_stat.st_mtime_ns,
+            search_stat and search_stat.st_size,
+        )
+
+    def _load(self, locale, path, search_path, signature):
+        if path.suffix == ".pack":
+            champions = ChampionPack(path)
+        else:
+            with open(path, "r", encoding="utf-8") as file:
+                champions = loads(file.read())
+
+        search = None
+        if signature[2] is not None:
+            with open(search_path, "r", encoding="utf-8") as file:
+                search = SearchIndex(loads(file.read()))
+
+        return LocaleSnapshot(
+            locale=locale,
+            path=path,
+            signature=signature,
+            source=champions,
+            aliases=MappingProxyType(
+                {champ_id.casefold(): champ_id for champ_id in champions.keys()}
+            ),
+            search=search,
+            brotli_quality=self.brotli_quality,
+        )
+
+    def refresh(self, force=False):
+        """
+        Reload the locale files changed on disk since the last check.
+        """
+
+        if not force and monotonic() - self._checked_at < self.reload_interval:
+            return
+
+        # a single request rebuilds the snapshots, the others keep serving the current ones
+        if not self._lock.acquire(blocking=force):
+            return
+
+        try:
+            self._checked_at = monotonic()
+            current = self._snapshots
+            snapshots = {}
+
+            paths = {}
+            if self.data_dir.is_dir():
+                for suffix in self.SUFFIXES:
+                    for path in self.data_dir.glob(f"*{suffix}"):
+                        paths.setdefault(path.name.removesuffix(suffix), []).append(
+                            path
+                        )
+
+            # locale -> data files, newest first: the pack, unless the JSON has been
+            # regenerated after it; a file that fails to load falls back to the other one
+            paths = {
+                locale: sorted(found, key=_mtime, reverse=True)
+                for locale, found in paths.items()
+            }
+
+            for locale, candidates in sorted(paths.items()):
+                snapshot = current.get(locale)
+
+                for path in candidates:
+                    search_path = path.with_name(f"{locale}{self.SEARCH_SUFFIX}")
+                    signature = None
+                    try:
+                        signature = self._signature(path, search_path)
+                        if self._failed.get(path) == signature:
+                            continue
+
+                        if (
+                            snapshot is None
+                            or snapshot.path != path
+                            or snapshot.signature != signature
+                        ):
+                            snapshot = self._load(locale, path, search_path, signature)
+                            self.logger.info(f"✅  Champion data loaded: {locale}")
+                        break
+
+                    except (OSError, ValueError) as e:
+                        # keep serving the previous version of a file being rewritten
+                        self._failed[path] = signature
+                        self.logger.error(f"⚠️  Error loading champion data {path}: {e}")
+
+                if snapshot is not None:
+                    snapshots[locale] = snapshot
+
+            self._snapshots = MappingProxyType(snapshots)
+            self.default_locale = self._pick_default(snapshots)
+
+        finally:
+            self._lock.release()
+
+    def _pick_default(self, snapshots):
+        """
+        Return the configured default locale, or the first available one if it is missing.
+        """
+
+        if self.configured_locale in snapshots or not snapshots:
+            return self.configured_locale
+
+        fallback = next(iter(snapshots))
+        if fallback != self.default_locale:
+            self.logger.warning(
+                f"⚠️  Default locale {self.configured_locale} not available, "
+                f"using {fallback}"
+            )
+        return fallback
+
+    def get(self, locale=None):
+        self.refresh()
+        return self._snapshots.get(locale or self.default_locale)
+
+
+champion_store = ChampionStore()
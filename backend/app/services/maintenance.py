@@ -0,0 +1,133 @@
+import threading
+from datetime import datetime, timezone
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import Index, delete, select
+
+from app.database.models import db, EmailToken
+
+
+def purge_expired(column, now, batch_size, max_batches=None):
+    """
+    Delete the rows whose `column` is before `now`, `batch_size` rows per transaction.
+
+    Every batch is a range scan on the index of `column`, so the locks are short and a
+    backlog of expired rows never turns into one huge delete. Return the deleted rows.
+    """
+
+    table = column.table
+    (key,) = table.primary_key.columns
+    deleted, batches = 0, 0
+
+    while max_batches is None or batches < max_batches:
+        ids = (
+            db.session.execute(
+                select(key).where(column <= now).order_by(column).limit(batch_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+
+        db.session.execute(delete(table).where(key.in_(ids)))
+        db.session.commit()
+
+        deleted += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+
+    return deleted
+
+
+def session_model(app):
+    """
+    Return the model of the `Flask-Session` table, `None` with the other backends.
+    """
+
+    return getattr(app.session_interface, "sql_session_model", None)
+
+
+def ensure_indexes(app):
+    """
+    Create the index on the expiry of the sessions table (created by `Flask-Session` without it).
+    """
+
+    model = session_model(app)
+    if model is not None:
+        Index(f"ix_{model.__tablename__}_expiry", model.expiry).create(
+            bind=db.engine, checkfirst=True
+        )
+
+
+def run_maintenance(app, batch_size=None, max_batches=None):
+    """
+    Delete expired email tokens and database sessions, return the deleted rows per table.
+    """
+
+    batch_size = batch_size or app.config["MAINTENANCE_BATCH_SIZE"]
+    deleted = {}
+
+    try:
+        deleted["email_tokens"] = purge_expired(
+            EmailToken.expires_at,
+            datetime.now(timezone.utc),
+            batch_size,
+            max_batches,
+        )
+
+        model = session_model(app)
+        if model is not None:
+            ensure_indexes(app)
+            # Flask-Session stores naive UTC expiry dates
+            deleted[model.__tablename__] = purge_expired(
+                model.expiry,
+                datetime.now(timezone.utc).replace(tzinfo=None),
+                batch_size,
+                max_batches,
+            )
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return deleted
+
+
+def start_maintenance_thread(app):
+    """
+    Run the maintenance every `MAINTENANCE_INTERVAL` seconds in a daemon thread of the server.
+    """
+
+    def loop():
+        stop = threading.Event()
+        while not stop.wait(app.config["MAINTENANCE_INTERVAL"]):
+            with app.app_context():
+                try:
+                    deleted = run_maintenance(app)
+                    app.logger.info(f"✅  Maintenance done: {deleted}")
+                except Exception as e:
+                    app.logger.error(f"❗  Maintenance failed: {e}")
+
+    thread = threading.Thread(target=loop, name="maintenance", daemon=True)
+    thread.start()
+    return thread
+
+
+@click.command("maintenance")
+@click.option("--batch-size", type=int, help="Rows deleted per transaction.")
+@click.option("--max-batches", type=int, help="Stop after this many batches per table.")
+@with_appcontext
+def maintenance_command(batch_size, max_batches):
+    """
+    Delete expired email tokens and sessions.
+    """
+
+    deleted = run_maintenance(
+        current_app._get_current_object(), batch_size, max_batches
+    )
+    for table, count in deleted.items():
+        click.echo(f"✅  {table}: {count} expired rows deleted")
@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(RuntimeError):
+    """
+    Raised when too many hashes are already queued: the request should be retried later.
+    """
+
+
+class HashingTimeout(HashingBusy):
+    """
+    Raised when a hash does not end within `PASSWORD_HASH_TIMEOUT` (slow or stuck worker).
+    """
+
+
+class PasswordHasher:
+    """
+    Password hashing in a bounded pool of processes, off the request thread.
+
+    Cost parameters come from `PASSWORD_HASH_METHOD` (werkzeug format, e.g. `scrypt:32768:8:1`
+    or `pbkdf2:sha256:1000000`). At most `PASSWORD_HASH_MAX_PENDING` hashes can be queued or
+    running at once: further requests wait up to `PASSWORD_HASH_QUEUE_TIMEOUT` seconds for a
+    slot, then `HashingBusy` is raised instead of piling up CPU work; a hash running longer
+    than `PASSWORD_HASH_TIMEOUT` seconds raises `HashingTimeout`, a `HashingBusy` as well.
+    With `PASSWORD_HASH_WORKERS = 0` hashes run on the calling thread.
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.salt_length = 16
+        self.workers = 0
+        self.queue_timeout = 1.0
+        self.timeout = 10.0
+
+        self._slots = threading.BoundedSemaphore(1)
+        self._executor = None
+        self._pid = None
+        self._prefix = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config["PASSWORD_HASH_METHOD"]
+        self.salt_length = app.config["PASSWORD_HASH_SALT_LENGTH"]
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.queue_timeout = app.config["PASSWORD_HASH_QUEUE_TIMEOUT"]
+        self.timeout = app.config["PASSWORD_HASH_TIMEOUT"]
+
+        max_pending = app.config["PASSWORD_HASH_MAX_PENDING"] or 4 * max(
+            1, self.workers
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._prefix = None
+
+        app.extensions["password_hasher"] = self
+
+    def _pool(self):
+        # the pool is created in the process that uses it (e.g. after the gunicorn fork)
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        slots = self._slots
+        if not slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusy("Too many password hashes in progress")
+        try:
+            future = self._pool().submit(func, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        # the slot is freed when the hash ends, not when the caller stops waiting for it
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingTimeout("Password hash did not end in time") from None
+
+    def hash(self, password):
+        return self._run(
+            generate_password_hash, password, self.method, self.salt_length
+        )
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """
+        Tell whether a stored hash was made with cost parameters different from the current ones.
+        """
+
+        if self._prefix is None:
+            # werkzeug fills in the defaults of a short method (`scrypt` -> `scrypt:32768:8:1`)
+            self._prefix = generate_password_hash("", self.method, 1).split("$", 1)[0]
+        return pwhash.split("$", 1)[0] != self._prefix
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
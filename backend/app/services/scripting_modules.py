@@ -0,0 +1,17 @@
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+
+# Extractor folder: its modules define the formats of the data files read by the backend
+SCRIPTING_PATH = Path(__file__).resolve().parents[3] / "scripting"
+
+
+def load_scripting_module(name):
+    """
+    Load `scripting/<name>.py` without adding the extractor folder to `sys.path`.
+    """
+
+    spec = spec_from_file_location(f"scripting_{name}", SCRIPTING_PATH / f"{name}.py")
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
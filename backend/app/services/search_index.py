@@ -0,0 +1,163 @@
+from bisect import bisect_left
+from functools import lru_cache
+from heapq import nlargest
+
+from app.services.scripting_modules import load_scripting_module
+
+
+# Normalization and tokenization come from `scripting/search_index.py`, which builds the index
+# files: queries are always normalized like the indexed terms
+indexing = load_scripting_module("search_index")
+NORMALIZATION = indexing.NORMALIZATION
+normalize = indexing.normalize
+
+# Score multipliers for the kind of match between a query word and an indexed term
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.4
+
+# Shorter words are not matched with typos: too many unrelated terms are one edit away
+FUZZY_MIN_LENGTH = 3
+
+
+def query_words(query):
+    """
+    Return the distinct normalized words of a query, in order.
+    """
+
+    return tuple(dict.fromkeys(indexing.tokenize(query)))
+
+
+def _deletes(term):
+    """
+    Return the term with each single character removed.
+    """
+
+    return {term[:i] + term[i + 1 :] for i in range(len(term))}
+
+
+def _within_one_edit(a, b):
+    """
+    Levenshtein distance between `a` and `b` is at most 1.
+    """
+
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+
+    # substitution (same length) or insertion (b one longer)
+    return a[i + 1 :] == b[i + 1 :] if len(a) == len(b) else a[i:] == b[i + 1 :]
+
+
+class SearchIndex:
+    """
+    Ranked search over the inverted index generated by the scripting module (`<locale>_search.json`).
+
+    Every query word matches indexed terms exactly, by prefix or with one typo
+    (candidates found through a precomputed single-deletion table).
+    A champion must match every word; its score is the sum, over the words, of the best
+    field weight times the kind of match. Results of repeated queries are cached.
+    """
+
+    def __init__(self, data, cache_size=4096):
+        if data.get("normalization") != NORMALIZATION:
+            raise ValueError(
+                f"Unsupported search index normalization: {data.get('normalization')}"
+            )
+
+        self.docs = tuple((champ_id, name) for champ_id, name in data["docs"])
+        self.terms = tuple(term for term, _ in data["terms"])
+        self.postings = tuple(
+            tuple((doc, weight) for doc, weight in postings)
+            for _, postings in data["terms"]
+        )
+        self._positions = {term: position for position, term in enumerate(self.terms)}
+
+        # deleted variant -> positions of the terms producing it
+        deletes = {}
+        for position, term in enumerate(self.terms):
+            if len(term) >= FUZZY_MIN_LENGTH:
+                for variant in _deletes(term):
+                    deletes.setdefault(variant, []).append(position)
+        self._deletes = {variant: tuple(found) for variant, found in deletes.items()}
+
+        self._cached_rank = lru_cache(maxsize=cache_size)(self.rank)
+
+    def _matches(self, word):
+        """
+        Return the positions of the terms matching `word` with their multiplier.
+        """
+
+        matches = {}
+
+        start = bisect_left(self.terms, word)
+        for position in range(start, len(self.terms)):
+            term = self.terms[position]
+            if not term.startswith(word):
+                break
+            matches[position] = EXACT if term == word else PREFIX
+
+        if len(word) >= FUZZY_MIN_LENGTH:
+            candidates = set(self._deletes.get(word, ()))
+            for variant in _deletes(word):
+                candidates.update(self._deletes.get(variant, ()))
+                if variant in self._positions:
+                    candidates.add(self._positions[variant])
+
+            for position in candidates:
+                if position not in matches and _within_one_edit(
+                    word, self.terms[position]
+                ):
+                    matches[position] = FUZZY
+
+        return matches
+
+    def rank(self, words, limit):
+        """
+        Rank the champions for already normalized `words` (uncached).
+        """
+
+        scores = None
+
+        for word in words:
+            best = {}
+            for position, multiplier in self._matches(word).items():
+                for doc, weight in self.postings[position]:
+                    score = weight * multiplier
+                    if score > best.get(doc, 0):
+                        best[doc] = score
+
+            if scores is None:
+                scores = best
+            else:
+                scores = {
+                    doc: score + best[doc]
+                    for doc, score in scores.items()
+                    if doc in best
+                }
+
+            if not scores:
+                return ()
+
+        top = nlargest(
+            limit,
+            scores.items(),
+            key=lambda item: (item[1], -item[0]),
+        )
+        return tuple(
+            (self.docs[doc][0], self.docs[doc][1], round(score, 2))
+            for doc, score in top
+        )
+
+    def search(self, query, limit=10):
+        """
+        Return up to `limit` tuples (id, name, score), best first.
+        """
+
+        words = query_words(query)
+        if not words or limit < 1:
+            return ()
+        return self._cached_rank(words, limit)
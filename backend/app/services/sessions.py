@@ -0,0 +1,50 @@
+import redis
+from cachelib import SimpleCache
+from flask_session import Session
+
+
+SESSION_BACKENDS = ("cookie", "redis", "memory", "sqlalchemy")
+
+
+def init_sessions(app, db):
+    """
+    Configure the session backend chosen by `SESSION_BACKEND`:
+
+    - `cookie`: data signed with `SECRET_KEY` and kept by the browser, no storage at all
+      (signed, not encrypted: only for small, non secret values like the user id);
+    - `redis`: `Flask-Session` on Redis (`SESSION_REDIS_URI`), expired by Redis itself;
+    - `memory`: `Flask-Session` on an in-process cache with TTL, for a single worker;
+    - `sqlalchemy`: `Flask-Session` on the application database.
+
+    With `SESSION_REFRESH_EACH_REQUEST = False` a session is stored only when it changes.
+    """
+
+    backend = app.config["SESSION_BACKEND"]
+    lifetime = int(app.config["PERMANENT_SESSION_LIFETIME"].total_seconds())
+
+    if backend == "cookie":
+        # Flask default signed cookie session
+        return
+
+    if backend == "redis":
+        app.config["SESSION_TYPE"] = "redis"
+        app.config["SESSION_REDIS"] = app.config.get(
+            "SESSION_REDIS"
+        ) or redis.Redis.from_url(app.config["SESSION_REDIS_URI"])
+
+    elif backend == "memory":
+        app.config["SESSION_TYPE"] = "cachelib"
+        app.config["SESSION_CACHELIB"] = SimpleCache(
+            threshold=app.config["SESSION_MEMORY_THRESHOLD"], default_timeout=lifetime
+        )
+
+    elif backend == "sqlalchemy":
+        app.config["SESSION_TYPE"] = "sqlalchemy"
+        app.config["SESSION_SQLALCHEMY"] = db
+
+    else:
+        raise ValueError(
+            f"Unknown session backend: {backend} (one of {', '.join(SESSION_BACKENDS)})"
+        )
+
+    Session(app)
@@ -0,0 +1,131 @@
+import random
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from limits.storage import Storage
+
+
+def sqlite_path(uri):
+    """
+    Return the database path of a `sqlite:///<path>` URI (`sqlite:////abs/path` for absolute paths).
+    """
+
+    path = urlparse(uri).path
+    if not path or path == "/":
+        raise ValueError(f"Missing database path in URI: {uri}")
+    return path[1:]
+
+
+class SQLiteConnections:
+    """
+    One connection per thread to a SQLite database in WAL mode.
+
+    Every process on the same host opening the same file sees the same data:
+    it is the shared backend for deployments with several workers and no Redis.
+    """
+
+    def __init__(self, path, schema, timeout=5.0):
+        self.path = path
+        self.schema = schema
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def get(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # autocommit: transactions are opened explicitly with BEGIN IMMEDIATE
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.schema)
+            self._local.connection = connection
+        return connection
+
+
+class SQLiteStorage(Storage):
+    """
+    Flask-Limiter (`limits`) storage for fixed window counters in a SQLite database.
+
+    Registered for the `sqlite://` scheme, e.g. `RATELIMIT_STORAGE_URI=sqlite:////var/run/app/limits.db`.
+    Only the default `fixed-window` strategy is supported.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    # share of `incr` calls that also delete the expired counters
+    PURGE_PROBABILITY = 0.01
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        self._connections = SQLiteConnections(sqlite_path(uri), self.SCHEMA)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        connection = self._connections.get()
+
+        if random.random() < self.PURGE_PROBABILITY:
+            connection.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+
+        # the counter restarts when the window has expired
+        (value,) = connection.execute(
+            """
+            INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END,
+                expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END
+            RETURNING value
+            """,
+            (key, amount, now + expiry, now, now),
+        ).fetchone()
+        return value
+
+    def get(self, key):
+        row = (
+            self._connections.get()
+            .execute(
+                "SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = (
+            self._connections.get()
+            .execute(
+                "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self._connections.get().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._connections.get().execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key):
+        self._connections.get().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from app.database.models import db, User
+from app.database.unit_of_work import after_commit
+
+
+class UserCache:
+    """
+    Per-process LRU cache of the users loaded by `Flask-Login`, with a TTL.
+
+    Only the column values are cached: every request gets a new `User` built from them,
+    detached from the database session, so `current_user` costs no query.
+    `UserCRUD` invalidates an entry after committing a change to that user; the TTL bounds
+    how long other processes may serve the previous values.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.maxsize = app.config["USER_CACHE_SIZE"]
+        self.ttl = app.config["USER_CACHE_TTL"]
+        self.clear()
+        app.extensions["user_cache"] = self
+
+    def _get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, user_id, values):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def load(self, user_id):
+        """
+        Return a detached snapshot of the user, or `None` if it does not exist.
+        """
+
+        if not self.maxsize:
+            return db.session.get(User, user_id)
+
+        values = self._get(user_id)
+        if values is None:
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+
+            values = {
+                attribute.key: getattr(user, attribute.key)
+                for attribute in User.__mapper__.column_attrs
+            }
+            self._put(user_id, values)
+
+        return User(**values)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def invalidates_user(func):
+    """
+    Decorator for `UserCRUD` methods taking `user_id`: drop the cached user once they return
+    (after the commit, when applied outside `db_commiter`) or fail, and again when the
+    enclosing unit of work commits.
+    """
+
+    @wraps(func)
+    def wrapper(self, user_id, *args, **kwargs):
+        try:
+            return func(self, user_id, *args, **kwargs)
+        finally:
+            user_cache.invalidate(user_id)
+            after_commit(db.session, lambda: user_cache.invalidate(user_id))
+
+    return wrapper
@@ -1,20 +1,31 @@
 from functools import wraps
+from time import perf_counter
 from flask import current_app
+from app.database.unit_of_work import in_unit_of_work
 
 
 def db_commiter(db):
     """
     Decorator to commit or rollback changes to the database and log the result.
+    Inside a `unit_of_work` it only flushes: the unit of work commits or rolls back.
     """
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            if in_unit_of_work(db.session):
+                result = func(*args, **kwargs)
+                db.session.flush()
+                return result
+
             try:
                 result = func(*args, **kwargs)
                 db.session.flush()
+                started = perf_counter()
                 db.session.commit()
-                current_app.logger.info(f"✅  {func.__name__} commited.")
+                current_app.logger.info(
+                    f"✅  {func.__name__} commited in {(perf_counter() - started) * 1000:.1f} ms."
+                )
                 return result
 
             except Exception as e:
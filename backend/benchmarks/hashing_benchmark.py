@@ -0,0 +1,87 @@
+"""
+Benchmark of password verification for several hashing cost settings.
+
+Usage (from the `backend` folder):
+
+    python -m benchmarks.hashing_benchmark [method ...] [--workers N] [--logins N]
+
+For every werkzeug method (e.g. `scrypt:32768:8:1`, `pbkdf2:sha256:600000`) reports the time
+of a single verification, the logins/sec of one core and of the pool of `--workers` processes
+fed by concurrent request threads (as the login route does).
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+import os
+import threading
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.services.password_hasher import PasswordHasher
+
+METHODS = (
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:1000000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+    "scrypt:65536:8:1",
+)
+PASSWORD = "Correct-Horse-Battery-9"
+
+
+def pool_hasher(method, workers, logins):
+    hasher = PasswordHasher()
+    hasher.method = method
+    hasher.workers = workers
+    hasher.queue_timeout = 60.0
+    hasher.timeout = 60.0
+    # every request thread can queue its hash: this measures throughput, not rejections
+    hasher._slots = threading.BoundedSemaphore(logins)
+    return hasher
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("methods", nargs="*", default=METHODS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+
+    cores = min(args.workers, os.cpu_count())
+    print(f"{os.cpu_count()} cores, pool of {args.workers} workers")
+    print(
+        f"{'Method':<24} {'single':>10} {'1 core':>12} {'pool':>12} {'pool/core':>12}"
+    )
+
+    for method in args.methods:
+        pwhash = generate_password_hash(PASSWORD, method)
+
+        started = perf_counter()
+        for _ in range(args.logins):
+            check_password_hash(pwhash, PASSWORD)
+        single = (perf_counter() - started) / args.logins
+
+        hasher = pool_hasher(method, args.workers, args.logins)
+        hasher.verify(pwhash, PASSWORD)  # starts the pool
+        with ThreadPoolExecutor(max_workers=args.logins) as requests:
+            started = perf_counter()
+            results = list(
+                requests.map(
+                    lambda _: hasher.verify(pwhash, PASSWORD), range(args.logins)
+                )
+            )
+            pooled = args.logins / (perf_counter() - started)
+        hasher.shutdown()
+
+        if not all(results):
+            print(f"⚠️  {method}: verification failed")
+
+        print(
+            f"{method:<24} {single * 1000:8.1f} ms {1 / single:8.1f} /s "
+            f"{pooled:8.1f} /s {pooled / cores:8.1f} /s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of the champion pack against the JSON data file.
+
+Usage (from the `backend` folder, after generating `<locale>_data.pack` with the scripting module):
+
+    python -m benchmarks.pack_benchmark [locale] [--repeat N]
+
+Reports file sizes, the time to open each format and to read a single champion.
+"""
+
+from argparse import ArgumentParser
+from json import loads
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from config import Config
+from app.services.champion_pack import ChampionPack
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        function()
+        timings.append((perf_counter() - started) * 1000)
+    return median(timings)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("locale", nargs="?", default="italy")
+    parser.add_argument("--champion", default="Aatrox")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    folder = Path(Config.CHAMPIONS_DATA_DIR)
+    json_path = folder / f"{args.locale}_data.json"
+    pack_path = folder / f"{args.locale}_data.pack"
+
+    json_size, pack_size = json_path.stat().st_size, pack_path.stat().st_size
+    print(
+        f"Size      JSON {json_size / 1024:8.0f} KB   pack {pack_size / 1024:8.0f} KB "
+        f"({pack_size / json_size:.0%})"
+    )
+
+    def json_load():
+        return loads(json_path.read_text(encoding="utf-8"))
+
+    json_open = measure(json_load, args.repeat)
+    pack_open = measure(lambda: ChampionPack(pack_path), args.repeat)
+    print(f"Open      JSON {json_open:8.2f} ms   pack {pack_open:8.2f} ms")
+
+    json_one = measure(lambda: json_load()[args.champion], args.repeat)
+    pack_one = measure(lambda: ChampionPack(pack_path).get(args.champion), args.repeat)
+    print(f"One champ JSON {json_one:8.2f} ms   pack {pack_one:8.2f} ms")
+
+    pack = ChampionPack(pack_path)
+    pack_all = measure(
+        lambda: {champ_id: pack.get(champ_id) for champ_id in pack.keys()}, 5
+    )
+    print(f"Decode all (open pack)          pack {pack_all:8.2f} ms")
+
+    if {champ_id: pack.get(champ_id) for champ_id in pack.keys()} != json_load():
+        print("⚠️  The pack does not match the JSON: regenerate it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Load test of the database connection pool.
+
+Usage (from the `backend` folder):
+
+    python -m benchmarks.pool_load_test [--threads 1 2 4 8 16] [--pool-size 4] [--hold 20]
+
+Every thread runs requests that hold a connection for `--hold` ms (a query plus the request
+work). Once the threads exceed pool size + overflow, requests queue for a connection:
+reports latency percentiles, checkout wait and saturation from `pool_metrics`, and timeouts.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+import os
+
+from sqlalchemy import exc
+
+
+def request(app, db, hold):
+    started = perf_counter()
+    with app.app_context():
+        try:
+            db.session.execute(db.text("SELECT COUNT(*) FROM users")).scalar()
+            sleep(hold)
+        except exc.TimeoutError:
+            return None
+        finally:
+            db.session.remove()
+    return (perf_counter() - started) * 1000
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=(1, 2, 4, 8, 16))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-overflow", type=int, default=0)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    parser.add_argument("--hold", type=float, default=20, help="ms")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as folder:
+        os.environ.setdefault("SECRET_KEY", "pool-load-test")
+
+        from config import Config, ENGINE_PROFILES
+
+        Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(folder) / 'load.db'}"
+        Config.SQLALCHEMY_ENGINE_OPTIONS = {
+            **ENGINE_PROFILES["sqlite"],
+            "pool_size": args.pool_size,
+            "max_overflow": args.max_overflow,
+            "pool_timeout": args.pool_timeout,
+        }
+
+        from app import create_app
+        from app.database.models import db
+        from app.database.pool import pool_metrics
+
+        app = create_app()
+        app.logger.disabled = True
+        with app.app_context():
+            db.create_all()
+
+        print(
+            f"Pool: {args.pool_size} + {args.max_overflow} overflow, hold {args.hold} ms"
+        )
+        print(
+            f"{'Threads':>7} {'p50':>9} {'p95':>9} {'p99':>9} "
+            f"{'wait avg':>9} {'wait max':>9} {'sat.':>5} {'timeouts':>8}"
+        )
+
+        for threads in args.threads:
+            pool_metrics.reset()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                latencies = list(
+                    executor.map(
+                        lambda _: request(app, db, args.hold / 1000),
+                        range(args.requests),
+                    )
+                )
+
+            done = [latency for latency in latencies if latency is not None]
+            cuts = quantiles(done, n=100) if len(done) > 1 else done * 99
+            metrics = pool_metrics.snapshot()
+            print(
+                f"{threads:>7} {cuts[49]:6.1f} ms {cuts[94]:6.1f} ms {cuts[98]:6.1f} ms "
+                f"{metrics['avg_wait_ms']:6.1f} ms {metrics['max_wait_ms']:6.1f} ms "
+                f"{metrics['max_saturation']:5.0%} {metrics['timeouts']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
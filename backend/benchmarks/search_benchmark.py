@@ -0,0 +1,91 @@
+"""
+Benchmark of the champion search index.
+
+Usage (from the `backend` folder, after generating `<locale>_search.json` with the scripting module):
+
+    python -m benchmarks.search_benchmark [locale] [--repeat N]
+
+Reports the load time of the index and the latency of cold (uncached) and warm queries.
+"""
+
+from argparse import ArgumentParser
+from json import loads
+from pathlib import Path
+from statistics import median, quantiles
+from time import perf_counter
+
+from config import Config
+from app.services.search_index import SearchIndex, query_words
+
+
+QUERIES = (
+    "a",
+    "ah",
+    "aatrox",
+    "aatrx",
+    "miss fortune",
+    "kaisa",
+    "lama darkin",
+    "volpe",
+    "danni magici",
+    "ahri",
+    "jinx",
+    "jnx",
+    "evocatore",
+    "lee sin",
+    "tempesta",
+)
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        function()
+        timings.append((perf_counter() - started) * 1e6)
+    return timings
+
+
+def report(label, timings):
+    p99 = quantiles(timings, n=100)[98] if len(timings) > 1 else timings[0]
+    print(
+        f"{label:<8} median {median(timings):8.1f} µs   p99 {p99:8.1f} µs   "
+        f"max {max(timings):8.1f} µs"
+    )
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("locale", nargs="?", default="italy")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    path = Path(Config.CHAMPIONS_DATA_DIR) / f"{args.locale}_search.json"
+    data = loads(path.read_text(encoding="utf-8"))
+
+    started = perf_counter()
+    index = SearchIndex(data)
+    print(
+        f"Index {path.name}: {len(index.terms)} terms, {len(index.docs)} champions, "
+        f"loaded in {(perf_counter() - started) * 1000:.1f} ms\n"
+    )
+
+    # cold: bypass the result cache
+    cold = []
+    for query in QUERIES:
+        cold += measure(lambda: index.rank(query_words(query), 10), args.repeat)
+    report("cold", cold)
+
+    warm = []
+    for query in QUERIES:
+        warm += measure(lambda: index.search(query), args.repeat)
+    report("warm", warm)
+
+    print()
+    for query in QUERIES:
+        names = ", ".join(name for _, name, _ in index.search(query, 3))
+        print(f"{query!r:>16} -> {names}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark of the per-request latency of the session backends.
+
+Usage (from the `backend` folder):
+
+    python -m benchmarks.session_benchmark [backend ...] [--requests N] [--redis-uri URI]
+    python -m benchmarks.session_benchmark --refresh-each-request   # previous behaviour
+
+For every backend (`cookie`, `memory`, `sqlalchemy`, `redis`) a user logs in and requests
+`/dashboard` N times; reports the median and p95 latency and the session writes.
+Without `--redis-uri` the `redis` backend uses an in-process fakeredis client.
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import median, quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+
+BACKENDS = ("cookie", "memory", "sqlalchemy", "redis")
+PASSWORD = "Benchmark.Password1!"
+
+
+def session_writes(app):
+    """
+    Count the session writes of the server side backends, the cookie ones for `cookie`.
+    """
+
+    counter = {"writes": 0}
+    interface = app.session_interface
+
+    if hasattr(interface, "_upsert_session"):
+        upsert = interface._upsert_session
+
+        def counted(*args, **kwargs):
+            counter["writes"] += 1
+            return upsert(*args, **kwargs)
+
+        interface._upsert_session = counted
+    else:
+        save = interface.save_session
+
+        def counted(app, session, response):
+            save(app, session, response)
+            if any(
+                header.startswith(app.config["SESSION_COOKIE_NAME"])
+                for header in response.headers.getlist("Set-Cookie")
+            ):
+                counter["writes"] += 1
+
+        interface.save_session = counted
+
+    return counter
+
+
+def measure(backend, folder, requests, redis_uri, refresh):
+    from config import Config
+
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(folder) / f'{backend}.db'}"
+    Config.SESSION_BACKEND = backend
+    Config.SESSION_REFRESH_EACH_REQUEST = refresh
+    Config.WTF_CSRF_ENABLED = False
+    Config.RATELIMIT_ENABLED = False
+    Config.PASSWORD_HASH_WORKERS = 0
+    if backend == "redis" and not redis_uri:
+        from fakeredis import FakeRedis
+
+        Config.SESSION_REDIS = FakeRedis()
+    elif backend == "redis":
+        Config.SESSION_REDIS_URI = redis_uri
+
+    from app import create_app
+    from app.database.models import db
+
+    app = create_app()
+    app.logger.disabled = True
+    with app.app_context():
+        db.create_all()
+
+    client = app.test_client()
+    client.post(
+        "/auth/register",
+        data={
+            "username": "benchmark",
+            "email": "benchmark@example.com",
+            "password": PASSWORD,
+            "confirm_password": PASSWORD,
+        },
+    )
+
+    counter = session_writes(app)
+    timings = []
+    for _ in range(requests):
+        started = perf_counter()
+        response = client.get("/dashboard")
+        timings.append((perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{backend}: /dashboard answered {response.status_code}")
+
+    return median(timings), quantiles(timings, n=20)[-1], counter["writes"]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("backends", nargs="*", default=BACKENDS)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--redis-uri")
+    parser.add_argument("--refresh-each-request", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "session-benchmark")
+
+    print(f"{'Backend':<12} {'median':>10} {'p95':>10} {'writes':>8}")
+    with TemporaryDirectory() as folder:
+        for backend in args.backends:
+            middle, p95, writes = measure(
+                backend,
+                folder,
+                args.requests,
+                args.redis_uri,
+                args.refresh_each_request,
+            )
+            print(
+                f"{backend:<12} {middle:7.3f} ms {p95:7.3f} ms {writes:>5}/{args.requests}"
+            )
+
+
+if __name__ == "__main__":
+    main()
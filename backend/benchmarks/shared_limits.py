@@ -0,0 +1,121 @@
+"""
+Check that rate limits and bans are shared between several worker processes.
+
+Usage (from the `backend` folder):
+
+    python -m benchmarks.shared_limits --storage sqlite --workers 4
+    python -m benchmarks.shared_limits --storage redis --workers 4 [--redis-uri redis://localhost:6379/15]
+
+Every worker creates its own app (like a gunicorn worker) and hits `/auth/login` (limit 5/minute)
+from the same IP. With a shared storage the whole pool gets 5 successful responses and,
+once the IP is banned, every worker redirects it to the block page.
+With `memory://` each worker counts on its own: N times the limit.
+Without `--redis-uri` an in-process fakeredis server is started.
+"""
+
+from argparse import ArgumentParser
+from multiprocessing import Barrier, Process, Queue
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import os
+import socket
+
+LOGIN_LIMIT = 5
+
+
+def worker(env, barrier, requests, results):
+    os.environ.update(env)
+
+    from app import create_app
+
+    app = create_app()
+    app.logger.disabled = True
+    client = app.test_client()
+
+    barrier.wait()
+    statuses = [client.get("/auth/login").status_code for _ in range(requests)]
+
+    # every worker must see the ban set by whichever worker hit the limit
+    barrier.wait()
+    banned = client.get("/").headers.get("Location", "").endswith("/auth/block")
+
+    results.put((statuses.count(200), banned))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--storage", choices=("memory", "sqlite", "redis"), default="sqlite"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--redis-uri")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as folder:
+        server = None
+        if args.storage == "memory":
+            uri = "memory://"
+        elif args.storage == "sqlite":
+            uri = f"sqlite:///{Path(folder) / 'limits.db'}"
+        elif args.redis_uri:
+            uri = args.redis_uri
+        else:
+            from threading import Thread
+            from fakeredis import TcpFakeServer
+
+            port = free_port()
+            server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+            Thread(target=server.serve_forever, daemon=True).start()
+            uri = f"redis://127.0.0.1:{port}/0"
+
+            # fakeredis closes the connection after an error reply, so the NOSCRIPT -> SCRIPT LOAD
+            # fallback of redis-py never succeeds: the limiter scripts are loaded up front
+            from limits.storage import storage_from_string
+            from redis import Redis
+
+            storage, client = storage_from_string(uri), Redis.from_url(uri)
+            for name in dir(storage):
+                if name.startswith("lua_"):
+                    client.script_load(getattr(storage, name).script)
+
+        env = {
+            "SECRET_KEY": "shared-limits-check",
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{Path(folder) / 'app.db'}",
+            "RATELIMIT_STORAGE_URI": uri,
+            "BAN_STORAGE_URI": uri,
+        }
+
+        barrier = Barrier(args.workers, timeout=60)
+        results = Queue()
+        processes = [
+            Process(target=worker, args=(env, barrier, args.requests, results))
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [results.get(timeout=120) for _ in processes]
+        for process in processes:
+            process.join()
+
+        if server:
+            server.shutdown()
+
+    allowed = sum(count for count, _ in outcomes)
+    banned = sum(1 for _, flag in outcomes if flag)
+    expected = min(LOGIN_LIMIT, args.workers * args.requests)
+
+    print(f"Storage: {uri}")
+    print(f"Allowed requests: {allowed} (shared limit: {expected})")
+    print(f"Workers enforcing the ban: {banned}/{args.workers}")
+    print("✅  Limits shared" if allowed == expected else "❗  Limits NOT shared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark of the email token lookups as the table grows.
+
+Usage (from the `backend` folder):
+
+    python -m benchmarks.token_benchmark [--sizes 1000 10000 100000] [--lookups N]
+
+For every table size reports the median time of `EmailTokenCRUD.get_by_token` and `get_by_id`
+(indexed) and of the same token lookup forced to a full scan (`NOT INDEXED`, SQLite),
+i.e. the cost before the indexes were added.
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from random import Random
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+
+
+def measure(function, arguments):
+    timings = []
+    for argument in arguments:
+        started = perf_counter()
+        function(argument)
+        timings.append((perf_counter() - started) * 1_000_000)
+    return median(timings)
+
+
+def fill(db, EmailToken, size, users, random):
+    """
+    Insert `size` tokens for `users` users, half of them used or expired; return the tokens.
+    """
+
+    now = datetime.now(timezone.utc)
+    tokens, rows = [], []
+    for position in range(size):
+        token = f"token-{position}-{random.random()}"
+        tokens.append(token)
+        rows.append(
+            {
+                "user_id": random.randrange(users),
+                "token_digest": EmailToken.digest(token),
+                "used": position % 4 == 0,
+                "expires_at": now + timedelta(hours=1 if position % 2 else -1),
+            }
+        )
+    db.session.execute(EmailToken.__table__.insert(), rows)
+    db.session.commit()
+    return tokens
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=(1000, 10000, 100000))
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    random = Random(42)
+
+    with TemporaryDirectory() as folder:
+        os.environ.setdefault("SECRET_KEY", "token-benchmark")
+
+        from config import Config
+
+        Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(folder) / 'tokens.db'}"
+
+        from app import create_app
+        from app.database.models import db, EmailToken
+        from app.database.crud_operations import EmailTokenCRUD
+
+        app = create_app()
+        app.logger.disabled = True
+
+        print(f"{'Rows':>8} {'by token':>12} {'by user':>12} {'full scan':>12}")
+        with app.app_context():
+            crud = EmailTokenCRUD()
+            for size in args.sizes:
+                db.drop_all()
+                db.create_all()
+                users = max(1, size // 10)
+                tokens = fill(db, EmailToken, size, users, random)
+
+                sample = random.sample(tokens, min(args.lookups, size))
+                user_ids = [random.randrange(users) for _ in sample]
+
+                by_token = measure(crud.get_by_token, sample)
+                by_user = measure(crud.get_by_id, user_ids)
+                scan = measure(
+                    lambda token: db.session.execute(
+                        db.text(
+                            "SELECT id FROM email_tokens NOT INDEXED "
+                            "WHERE token_digest = :digest"
+                        ),
+                        {"digest": EmailToken.digest(token)},
+                    ).first(),
+                    sample[:50],
+                )
+                print(f"{size:>8} {by_token:9.1f} µs {by_user:9.1f} µs {scan:9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 from app import create_app
 
-app = create_app()
+# The password hashing processes (started with `spawn`) import this module as `__mp_main__`:
+# they only need the hash functions, not another app with its worker threads.
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
     app.run()
@@ -1,10 +1,16 @@
-// Variabile Globale per Caching dei dati
+// Cartella dei dati: indice leggero + un file per campione
+const DATA_PATH = "assets/united_kingdom";
+
+// Variabile Globale per Caching dei dati (indice dei campioni)
 let data = null;
 
+// Cache dei dettagli dei campioni già richiesti (id -> Promise)
+const champCache = new Map();
+
 document.addEventListener("DOMContentLoaded", async () => {
     // Controllo per verificare presenza dati già caricati nel sessionStorage
-    if (sessionStorage.getItem("data") === null) data = await getData(); 
-    else data = JSON.parse(sessionStorage.getItem("data"));
+    if (sessionStorage.getItem("index") === null) data = await getData(); 
+    else data = JSON.parse(sessionStorage.getItem("index"));
 
     // Caricamento del contenuto dinamico
     displayData(data);
@@ -12,14 +18,49 @@ document.addEventListener("DOMContentLoaded", async () => {
     document.dispatchEvent(new CustomEvent("dataLoaded", { detail: data }));
 })
 
-// Funzione asincrona per il fetching dei dati
+// Funzione asincrona per il fetching dell'indice (nome, nickname, icona e immagine della card)
 async function getData() {
-    const response = await fetch("assets/united_kingdom_data.json");
+    const response = await fetch(`${DATA_PATH}/index.json`);
     data = await response.json();
-    sessionStorage.setItem("data", JSON.stringify(data));
+    sessionStorage.setItem("index", JSON.stringify(data));
     return data;
 }
 
+// Funzione per il fetching su richiesta dei dettagli di un campione (abilità e skin)
+function loadChampion(id) {
+    if (!champCache.has(id)) {
+        const request = fetch(`${DATA_PATH}/champions/${encodeURIComponent(id)}.json`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .catch(error => {
+                // Rimozione dalla cache per consentire un nuovo tentativo
+                champCache.delete(id);
+                throw error;
+            });
+        champCache.set(id, request);
+    }
+    return champCache.get(id);
+}
+
+// Dimensione delle card in base alla viewport (griglia con colonne da min 250px)
+const CARD_SIZES = "(max-width: 600px) 100vw, 350px";
+
+// Funzione per l'immagine della card: versioni ridotte (srcset) se presenti, altrimenti splash originale
+function cardImage(champ) {
+    const card = champ.card;
+    const img = `<img src="${card.splash}" alt="${champ.name} default skin" loading="lazy" decoding="async">`;
+
+    if (!card.srcset) return img;
+
+    const sources = Object.entries(card.srcset)
+        .map(([type, srcset]) => `<source type="${type}" srcset="${srcset}" sizes="${CARD_SIZES}">`)
+        .join("");
+
+    return `<picture>${sources}${img}</picture>`;
+}
+
 // Funzione per caricare i dati dinamicamente nel DOM
 function displayData(data) {
     const cardsContainer = document.querySelector("#cards-container");
@@ -33,7 +74,7 @@ function displayData(data) {
         
         card.innerHTML = `
             <div class="img-container">
-                <img src="${champ.skins[0].splash}" alt="${champ.name} default skin">
+                ${cardImage(champ)}
             </div>
             <div class="name-container">
                 <h2>${champ.name}</h2>
@@ -5,7 +5,8 @@ document.addEventListener("dataLoaded", e => {
 
 class SearchController {
     constructor(data) {
-        this.data = data;              // data
+        this.data = data;              // indice dei campioni
+        this.requestedID = null;       // ultimo campione richiesto dal pannello
         this.activeIndex = -1;         // nessuna selezione 
         this.inputMode = "keyboard";   // switch keyboard/mouse
 
@@ -132,11 +133,21 @@ class SearchController {
         document.dispatchEvent(new CustomEvent("cardSelected", { detail: {id, ids} }))
     }    
 
-    // Metodo per passare i dati al PanelController
-    getData(id) {
-        const champ = this.data[id];
-        document.dispatchEvent(
-            new CustomEvent("currentChamp", { detail: champ}))
+    // Metodo per passare i dati al PanelController (dettagli caricati su richiesta)
+    async getData(id) {
+        this.requestedID = id;
+
+        try {
+            const champ = await loadChampion(id);
+
+            // Risposta superata da una richiesta più recente
+            if (this.requestedID !== id) return;
+
+            document.dispatchEvent(
+                new CustomEvent("currentChamp", { detail: champ}))
+        } catch (error) {
+            console.error(`Errore nel caricamento di ${id}:`, error);
+        }
     }
 
     // Sezione caricamento dinamico
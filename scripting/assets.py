@@ -0,0 +1,186 @@
+from json import loads, dumps
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import NamedTemporaryFile
+from typing import Iterable
+
+import logging
+import os
+import re
+import threading
+
+from scheduler import RequestScheduler
+
+
+# ============================================
+# ============  ASSET MIRRORING  =============
+# ============================================
+
+# URL con la patch nel percorso: il contenuto non cambia mai
+_VERSIONED = re.compile(r"/cdn/\d+\.\d+\.\d+/")
+
+
+@dataclass
+class MirrorStats:
+    """
+    Esito del mirroring: file scaricati, già aggiornati e falliti, byte scritti.
+    """
+
+    downloaded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes: int = 0
+
+
+class AssetMirror:
+    """
+    Copia in locale le immagini di Data Dragon mantenendo la struttura dei percorsi del CDN.
+
+    I download sono paralleli (massimo `max_workers`) e scritti a blocchi di `chunk_size` byte,
+    senza tenere l'immagine intera in memoria. Il file `manifest.json` conserva dimensione,
+    `ETag` e `Last-Modified` di ogni immagine per evitare di riscaricare quelle invariate.
+
+    Le immagini già presenti vengono saltate; con `revalidate=True` quelle senza patch nell'URL
+    (splash e loading) vengono controllate con una richiesta condizionale.
+    """
+
+    def __init__(
+        self,
+        scheduler: RequestScheduler,
+        folder: Path,
+        base_url: str,
+        logger: logging.Logger,
+        max_workers: int = 16,
+        chunk_size: int = 64 * 1024,
+        revalidate: bool = False,
+    ):
+        self._scheduler = scheduler
+        self._folder = folder
+        self._base_url = base_url
+        self._logger = logger
+        self._max_workers = max(1, max_workers)
+        self._chunk_size = chunk_size
+        self._revalidate = revalidate
+
+        self._folder.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self._folder / "manifest.json"
+        self._manifest: dict[str, dict] = (
+            loads(self._manifest_path.read_text(encoding="utf-8"))
+            if self._manifest_path.exists()
+            else {}
+        )
+        self._lock = threading.Lock()
+
+    def relative_path(self, url: str) -> str:
+        """
+        Restituisce il percorso locale (relativo alla cartella) dell'immagine di `url`.
+        """
+
+        if not url.startswith(self._base_url):
+            raise ValueError(f"URL esterno a Data Dragon: {url}")
+        return url[len(self._base_url) :].lstrip("/")
+
+    def _is_current(self, relative: str, path: Path) -> bool:
+        """
+        Indica se il file locale corrisponde a quello registrato nel manifest.
+        """
+
+        entry = self._manifest.get(relative)
+        return bool(entry) and path.exists() and path.stat().st_size == entry["size"]
+
+    def _download(self, url: str) -> tuple[str, int]:
+        """
+        Scarica una singola immagine. Restituisce l'esito (`downloaded`, `skipped`, `failed`) e i byte scritti.
+        """
+
+        relative = self.relative_path(url)
+        path = self._folder / relative
+
+        headers = {}
+        if self._is_current(relative, path):
+            # le immagini con la patch nell'URL non cambiano: nessuna richiesta
+            if not self._revalidate or _VERSIONED.search(url):
+                return "skipped", 0
+
+            entry = self._manifest[relative]
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with self._scheduler.request(
+                "GET", url, headers=headers, stream=True
+            ) as response:
+                if headers and response.status_code == 304:
+                    return "skipped", 0
+
+                response.raise_for_status()
+                path.parent.mkdir(parents=True, exist_ok=True)
+
+                # scrittura a blocchi su file temporaneo + rename
+                size = 0
+                with NamedTemporaryFile(
+                    dir=path.parent, suffix=".part", delete=False
+                ) as file:
+                    try:
+                        for chunk in response.iter_content(self._chunk_size):
+                            file.write(chunk)
+                            size += len(chunk)
+                    except BaseException:
+                        file.close()
+                        os.unlink(file.name)
+                        raise
+
+                expected = response.headers.get("Content-Length")
+                if expected and int(expected) != size:
+                    os.unlink(file.name)
+                    raise IOError(f"download incompleto ({size}/{expected} byte)")
+
+                os.chmod(file.name, 0o644)
+                os.replace(file.name, path)
+
+                with self._lock:
+                    self._manifest[relative] = {
+                        "size": size,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+
+                return "downloaded", size
+
+        except Exception as e:
+            self._logger.error(f"⚠️ Errore nel download di: {url}: {e}")
+            return "failed", 0
+
+    def mirror(self, urls: Iterable[str]) -> MirrorStats:
+        """
+        Scarica in parallelo tutte le immagini di `urls` (i duplicati vengono ignorati).
+        """
+
+        stats = MirrorStats()
+        unique_urls = tuple(dict.fromkeys(urls))
+
+        self._logger.info(f"ℹ️ Mirroring di {len(unique_urls)} immagini...")
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for outcome, size in executor.map(self._download, unique_urls):
+                setattr(stats, outcome, getattr(stats, outcome) + 1)
+                stats.bytes += size
+
+        self._save_manifest()
+
+        self._logger.info(
+            f"✅ Immagini scaricate: {stats.downloaded}, già aggiornate: {stats.skipped}, "
+            f"fallite: {stats.failed} ({stats.bytes / 1024 / 1024:.1f} MB)"
+        )
+        return stats
+
+    def _save_manifest(self) -> None:
+        with NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self._folder, suffix=".tmp", delete=False
+        ) as file:
+            file.write(dumps(self._manifest, indent=4))
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, self._manifest_path)
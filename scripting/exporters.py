@@ -0,0 +1,168 @@
+from json import loads, dumps
+from pathlib import Path
+from hashlib import sha256
+from typing import Iterable
+
+import gzip
+import os
+import re
+
+import brotli
+
+from json_writer import write_json_stream
+
+
+# ============================================
+# ============  SHARDED EXPORT  ==============
+# ============================================
+
+
+def _card(champ: dict) -> dict:
+    """
+    Restituisce l'immagine della card (skin di default) con l'eventuale `srcset`.
+    """
+
+    default_skin = champ["skins"]["0"]
+    card = {"splash": default_skin["splash"]}
+    if "srcset" in default_skin:
+        card["srcset"] = default_skin["srcset"]
+    return card
+
+
+def write_shards(json_path: Path, target_dir: Path, compact: bool = True) -> Path:
+    """
+    Divide un `*_data.json` in un indice leggero e un file per ogni campione.
+
+    - `index.json`: id -> `name`, `nickname`, `icon` e `card` (splash di default + `srcset`),
+      sufficiente per disegnare le card e la ricerca;
+    - `champions/<id>.json`: dati completi del campione (abilità e skin), da caricare su richiesta.
+
+    I file di campioni non più presenti vengono eliminati. Restituisce il path dell'indice.
+    """
+
+    with open(json_path, "r", encoding="utf-8") as file:
+        champions = loads(file.read())
+
+    champions_dir = target_dir / "champions"
+    champions_dir.mkdir(parents=True, exist_ok=True)
+
+    for champ_id, champ in champions.items():
+        write_json_stream(
+            champions_dir / f"{champ_id}.json", champ.items(), compact=compact
+        )
+
+    for stale in champions_dir.glob("*.json"):
+        if stale.stem not in champions:
+            stale.unlink()
+
+    index = (
+        (
+            champ_id,
+            {
+                "name": champ["name"],
+                "nickname": champ["nickname"],
+                "icon": champ["icon"],
+                "card": _card(champ),
+            },
+        )
+        for champ_id, champ in champions.items()
+    )
+
+    return write_json_stream(target_dir / "index.json", index, compact=compact)
+
+
+# ============================================
+# ============  RELEASE BUILD  ===============
+# ============================================
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """
+    Scrive `data` su file temporaneo + rename, con permessi standard.
+    """
+
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.write_bytes(data)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+
+def build_release(
+    sources: Iterable[Path], root: Path, target_dir: Path, hash_length: int = 12
+) -> Path:
+    """
+    Prepara i `JSON` per essere serviti come file immutabili.
+
+    Per ogni file di `sources` scrive in `target_dir` (mantenendo il percorso relativo a `root`):
+    - `<nome>.<hash>.json`: `JSON` minificato, con l'hash del contenuto nel nome;
+    - `<nome>.<hash>.json.gz` e `<nome>.<hash>.json.br`: versioni precompresse (gzip e brotli).
+
+    I file già presenti con lo stesso hash non vengono riscritti. Il `manifest.json` associa
+    ogni nome logico (es. `italy/index.json`) al nome con hash; dopo averlo scritto vengono
+    eliminati i file con hash (e le versioni precompresse) che non referenzia più.
+    Restituisce il path del manifest.
+    """
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    for source in sources:
+        logical = source.relative_to(root).as_posix()
+
+        with open(source, "r", encoding="utf-8") as file:
+            minified = dumps(
+                loads(file.read()), separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+
+        digest = sha256(minified).hexdigest()[:hash_length]
+        hashed = Path(logical).with_suffix(f".{digest}.json").as_posix()
+        path = target_dir / hashed
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # compressione deterministica (mtime fisso): stesso input -> stessi byte
+            _write_bytes(
+                path.with_name(f"{path.name}.gz"),
+                gzip.compress(minified, compresslevel=9, mtime=0),
+            )
+            _write_bytes(
+                path.with_name(f"{path.name}.br"),
+                brotli.compress(minified, mode=brotli.MODE_TEXT, quality=11),
+            )
+            # il file non compresso per ultimo: la sua presenza indica un output completo
+            _write_bytes(path, minified)
+
+        manifest[logical] = hashed
+
+    manifest_path = target_dir / "manifest.json"
+    _write_bytes(
+        manifest_path, dumps(manifest, indent=4, ensure_ascii=False).encode("utf-8")
+    )
+
+    _prune_release(target_dir, set(manifest.values()), hash_length)
+    return manifest_path
+
+
+def _prune_release(target_dir: Path, referenced: set[str], hash_length: int) -> None:
+    """
+    Elimina da `target_dir` i file con hash delle build precedenti non presenti in `referenced`,
+    insieme alle cartelle rimaste vuote.
+    """
+
+    hashed_name = re.compile(rf"\.[0-9a-f]{{{hash_length}}}\.json(?:\.gz|\.br)?$")
+
+    for path in target_dir.rglob("*.json*"):
+        if not hashed_name.search(path.name):
+            continue
+
+        asset = path.relative_to(target_dir).as_posix()
+        if asset.removesuffix(".gz").removesuffix(".br") not in referenced:
+            path.unlink()
+
+    # dalla cartella più profonda: le cartelle dei campioni prima di quelle delle lingue
+    for folder in sorted(
+        target_dir.rglob("*"), key=lambda p: len(p.parts), reverse=True
+    ):
+        if folder.is_dir() and not any(folder.iterdir()):
+            folder.rmdir()
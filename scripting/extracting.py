@@ -1,13 +1,28 @@
-from json import loads, dump
+from json import loads, dump, dumps
+from hashlib import sha256
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import repeat
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from re import match
 
+from http_cache import ResponseCache, CacheMissError
+from sanitizer import html_to_text
+from scheduler import RequestScheduler, RequestStats
+from assets import AssetMirror, MirrorStats
+from images import make_derivatives, available_formats, CARD_WIDTHS
+from json_writer import write_json_stream
+from exporters import write_shards, build_release
+from search_index import build_search_index
+from packing import write_pack
+from history import HistoryStore, PATCH_PATTERN, patch_key
+
 import logging
 
-from typing import Any
+from typing import Any, Iterable
 
 # =========================
 
@@ -15,6 +30,21 @@ from typing import Any
 DATA_PATH = Path("scripting/data")
 DATA_PATH.mkdir(exist_ok=True)
 
+# Definizione cartella della cache HTTP
+CACHE_DIR = DATA_PATH / "cache"
+
+# Definizione cartella delle immagini scaricate
+ASSETS_DIR = DATA_PATH / "assets"
+
+# Definizione cartella delle versioni ridotte delle splash (card)
+CARDS_DIR = ASSETS_DIR / "cards"
+
+# Definizione cartella dello storico delle patch
+HISTORY_DIR = DATA_PATH / "history"
+
+# Definizione cartella dei file pronti per la pubblicazione (minificati, con hash, compressi)
+BUILD_DIR = DATA_PATH / "build"
+
 # Definizione cartella di log
 LOG_DIR = Path("scripting/logs")
 LOG_DIR.mkdir(exist_ok=True)
@@ -79,36 +109,135 @@ class LeagueAPI:
 
     Usa una sessione HTTP per ottimizzare le connessioni e fornisce un metodo interno `_get`
     per fare richieste sicure e centralizzare la gestione degli errori.
+
+    `max_workers` stabilisce quante richieste per i singoli campioni possono essere eseguite
+    in parallelo (con `1` il download torna sequenziale), `pool_maxsize` la dimensione del
+    pool di connessioni (default uguale a `max_workers`).
+
+    Le risposte vengono salvate in `cache_dir` e rivalidate con richieste condizionali
+    (`If-None-Match` / `If-Modified-Since`); con `offline=True` vengono servite solo dalla cache.
+    Impostando `cache_dir=None` la cache viene disattivata.
+
+    Ogni richiesta passa da un `RequestScheduler`: timeout di connessione/lettura, retry con
+    backoff esponenziale sugli errori temporanei e limite di `rate_limit` richieste al secondo per host.
     """
 
     # Costruttore classe
-    def __init__(self, base_url="https://ddragon.leagueoflegends.com/"):
+    def __init__(
+        self,
+        base_url="https://ddragon.leagueoflegends.com/",
+        max_workers: int = 16,
+        pool_maxsize: int = None,
+        cache_dir: Path = CACHE_DIR,
+        cache_max_size: int = 256 * 1024 * 1024,
+        offline: bool = False,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 4,
+        rate_limit: float = 100.0,
+    ):
         self._base_url = base_url
+        self._max_workers = max(1, max_workers)
 
         # Inizializzazione sessione
         self.session = requests.Session()
 
+        # Adapter condiviso con pool di connessioni dimensionato sui worker
+        adapter = HTTPAdapter(
+            pool_connections=self._max_workers,
+            pool_maxsize=pool_maxsize or self._max_workers,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         # Inizializzazione logger
         self._extracting_log = "extracting_data"
         self._logger = get_logger(self._extracting_log)
 
+        # Inizializzazione scheduler (timeout, retry, limite per host)
+        self._scheduler = RequestScheduler(
+            self.session,
+            self._logger,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            rate_limit=rate_limit,
+            burst=self._max_workers,
+        )
+
         # Inizializzazione dizionario (caching dati)
         self._champions_data: dict[str, dict] = {}
 
+        # Inizializzazione cache HTTP su disco
+        self._cache = ResponseCache(cache_dir, cache_max_size) if cache_dir else None
+        self._offline = offline
+
+        if self._offline and not self._cache:
+            raise ValueError("La modalità offline richiede una cartella di cache.")
+
+    @property
+    def request_stats(self) -> RequestStats:
+        """
+        Contatori delle richieste (totali, retry, fallimenti, tempo perso e di attesa).
+        """
+
+        return self._scheduler.stats
+
     def _get(self, url: str) -> dict[str, Any]:
         """
         Esegue una `GET` usando la sessione.
         Gestisce gli errori delle richieste e restituisce `JSON`.
+
+        Se la risposta è in cache viene rivalidata: con `304 Not Modified` si usa il contenuto salvato.
         """
 
+        entry = self._cache.lookup(url) if self._cache else None
+
         # Blocco try/except per la gestione degli errori
         try:
 
-            # Tentativo di richiesta HTTP
-            response = self.session.get(url)
+            # Modalità offline: solo risposte già salvate
+            if self._offline:
+                if entry is None:
+                    raise CacheMissError(f"URL non presente in cache: {url}")
+
+                body = self._cache.read(entry)
+                if body is None:
+                    raise CacheMissError(f"URL non più presente in cache: {url}")
+
+                self._logger.info(f"ℹ️ Letto dalla cache: {url}")
+                return loads(body)
+
+            # Tentativo di richiesta HTTP (condizionale se presente in cache)
+            response = self._scheduler.request(
+                "GET",
+                url,
+                headers=self._cache.conditional_headers(entry) if entry else None,
+            )
+
+            if entry and response.status_code == 304:
+                body = self._cache.read(entry)
+                if body is not None:
+                    self._logger.info(f"ℹ️ Non modificato, letto dalla cache: {url}")
+                    return loads(body)
+
+                # Contenuto eliminato dalla cache durante la richiesta: richiesta completa
+                self._logger.warning(
+                    f"⚠️ Contenuto non più in cache, riscaricato: {url}"
+                )
+                response = self._scheduler.request("GET", url)
+
             response.raise_for_status()
             self._logger.info(f"ℹ️ Connessione a: {url}")
 
+            if self._cache:
+                self._cache.store(
+                    url,
+                    response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+
             # Restituzione `JSON` della risposta
             return response.json()
 
@@ -147,7 +276,7 @@ class LeagueAPI:
 
         try:
             url = "https://developer.riotgames.com/docs/lol#data-dragon_languages"
-            response = requests.get(url)
+            response = self._scheduler.request("GET", url)
             response.raise_for_status()
 
             self._logger.info(f" ℹ️Connessione a: {url}")
@@ -190,60 +319,162 @@ class LeagueAPI:
             self._logger.error(f"⚠️ Errore nella richiesta verso: {url}: {e}")
             raise
 
+    def get_roster(self, patch: str, code_lang: str) -> dict[str, dict]:
+        """
+        Restituisce il contenuto di `champion.json`: un dizionario id -> dati riassuntivi del campione.
+        """
+
+        url = f"{self._base_url}cdn/{patch}/data/{code_lang}/champion.json"
+        return self._get(url)["data"]
+
     def get_champions(self, patch: str, code_lang: str) -> tuple[tuple[str, dict]]:
         """
         Restituisce una tupla di tuple contenenti come primo elemento l'id del campione e come secondo i dizionari aventi `name` e `nickname`
         """
 
-        url = f"{self._base_url}cdn/{patch}/data/{code_lang}/champion.json"
-        data = self._get(url)
+        data = self.get_roster(patch, code_lang)
 
         self._logger.info(f"✅ Informazioni sui nomi dei campioni scaricate.")
 
         return tuple(
             [
                 (info["id"], {"name": info["name"], "nickname": info["title"]})
-                for info in data["data"].values()
+                for info in data.values()
             ]
         )
 
-    def get_abilities(self, patch: str, code_lang: str) -> tuple[tuple[str, dict]]:
+    def _get_champion(self, patch: str, code_lang: str, champ_id: str) -> dict:
         """
-        Restituisce una tupla contenente id del campione e un dizionario con le sue abilità.
+        Scarica il `JSON` dettagliato di un singolo campione e ne restituisce i dati.
         """
 
-        champion_ids = [id[0] for id in self.get_champions(patch, code_lang)]
+        url = f"{self._base_url}cdn/{patch}/data/{code_lang}/champion/{champ_id}.json"
+        return self._get(url)["data"][champ_id]
 
-        self._logger.info(f"ℹ️ Scaricando le abilità...")
+    def _iter_champions_data(
+        self, patch: str, code_lang: str, champion_ids: tuple[str]
+    ) -> Iterable[tuple[str, dict]]:
+        """
+        Scarica in parallelo i `JSON` dettagliati dei campioni indicati.
 
-        champ_abilities = []
-        for champ_id in champion_ids:
-            url = (
-                f"{self._base_url}cdn/{patch}/data/{code_lang}/champion/{champ_id}.json"
+        Produce le coppie (id, dati) nell'ordine di `champion_ids`, appena ogni campione è pronto.
+        """
+
+        # `map` restituisce i risultati nello stesso ordine degli id
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            champions = executor.map(
+                lambda champ_id: self._get_champion(patch, code_lang, champ_id),
+                champion_ids,
             )
-            data = self._get(url)
-            self._champions_data[champ_id] = data["data"][champ_id]
-
-            abilities_dict = {
-                "passive": {
-                    "name": data["data"][champ_id]["passive"]["name"],
-                    "description": BeautifulSoup(
-                        data["data"][champ_id]["passive"]["description"], "html.parser"
-                    ).get_text(),
-                }
+            yield from zip(champion_ids, champions)
+
+    def _get_champions_data(
+        self, patch: str, code_lang: str, champion_ids: tuple[str]
+    ) -> dict[str, dict]:
+        """
+        Restituisce un dizionario id -> dati dettagliati che mantiene l'ordine di `champion_ids`.
+        """
+
+        return dict(self._iter_champions_data(patch, code_lang, champion_ids))
+
+    @staticmethod
+    def _build_abilities(champ_data: dict) -> dict[str, dict]:
+        """
+        Restituisce il dizionario delle abilità (`passive`, `q`, `w`, `e`, `r`) di un campione.
+        """
+
+        abilities_dict = {
+            "passive": {
+                "name": champ_data["passive"]["name"],
+                "description": html_to_text(champ_data["passive"]["description"]),
+            }
+        }
+
+        ability_keys = ("q", "w", "e", "r")
+        for spell, key in zip(champ_data["spells"], ability_keys):
+            abilities_dict[key] = {
+                "name": spell["name"],
+                "description": html_to_text(spell["description"]),
             }
 
-            ability_keys = ("q", "w", "e", "r")
-            for spell, key in zip(data["data"][champ_id]["spells"], ability_keys):
-                abilities_dict[key] = {
-                    "name": spell["name"],
-                    "description": BeautifulSoup(
-                        spell["description"], "html.parser"
-                    ).get_text(),
+        return abilities_dict
+
+    def _build_icons(self, patch: str, champ_data: dict) -> dict[str, str]:
+        """
+        Restituisce il dizionario con gli URL delle icone di un campione (abilità incluse).
+
+        I nomi dei file delle immagini non dipendono dalla lingua.
+        """
+
+        icon_champ_id = champ_data["image"]["full"]
+        icon_passive_id = champ_data["passive"]["image"]["full"]
+        icon_spell_ids = [
+            spell_id["image"]["full"] for spell_id in champ_data["spells"]
+        ]
+
+        icons_dict = {
+            "champ_icon": f"{self._base_url}cdn/{patch}/img/champion/{icon_champ_id}",
+            "passive_icon": f"{self._base_url}cdn/{patch}/img/passive/{icon_passive_id}",
+        }
+
+        abilities = ("q", "w", "e", "r")
+        for spell_id, ability in zip(icon_spell_ids, abilities):
+            icons_dict[f"{ability}_icon"] = (
+                f"{self._base_url}cdn/{patch}/img/spell/{spell_id}"
+            )
+
+        return icons_dict
+
+    def _build_skin_urls(
+        self, champ_id: str, champ_data: dict
+    ) -> tuple[dict[str, str]]:
+        """
+        Restituisce una tupla di dizionari con `splash` e `loading` per ogni skin del campione.
+
+        I numeri delle skin non dipendono dalla lingua, i nomi invece sì e vanno aggiunti a parte.
+        """
+
+        # Eccezione sul nome dei file di Fiddlesticks
+        prefix = "FiddleSticks" if champ_id.lower() == "fiddlesticks" else champ_id
+
+        skin_urls = []
+        for skin in champ_data["skins"]:
+            splash_url = (
+                f"{self._base_url}cdn/img/champion/splash/{prefix}_{skin['num']}.jpg"
+            )
+            skin_urls.append(
+                {
+                    "splash": splash_url,
+                    "loading": splash_url.replace("splash", "loading"),
                 }
+            )
+
+        return tuple(skin_urls)
+
+    def get_abilities(
+        self, patch: str, code_lang: str, champion_ids: tuple[str] = None
+    ) -> tuple[tuple[str, dict]]:
+        """
+        Restituisce una tupla contenente id del campione e un dizionario con le sue abilità.
+
+        I `JSON` dei campioni vengono scaricati in parallelo (massimo `max_workers` richieste
+        contemporanee), l'ordine dei risultati resta quello di `get_champions`.
+        Se `champion_ids` viene specificato, la lista dei campioni non viene riscaricata.
+        """
+
+        if champion_ids is None:
+            champion_ids = tuple(id[0] for id in self.get_champions(patch, code_lang))
+
+        self._logger.info(f"ℹ️ Scaricando le abilità...")
+
+        champ_abilities = []
+        for champ_id, champ_data in self._get_champions_data(
+            patch, code_lang, champion_ids
+        ).items():
+            self._champions_data[champ_id] = champ_data
 
             self._logger.info(f"✔️ Informazioni sulle abilità di {champ_id} scaricate.")
-            champ_abilities.append((champ_id, abilities_dict))
+            champ_abilities.append((champ_id, self._build_abilities(champ_data)))
 
         self._logger.info(f"✅ Abilità scaricate.")
         return tuple(champ_abilities)
@@ -264,32 +495,8 @@ class LeagueAPI:
         self._logger.info(f"ℹ️ Scaricando le icone...")
         champ_icons = []
         for champ_id, champ_data in self._champions_data.items():
-            icon_champ_id = champ_data["image"]["full"]
-            icon_passive_id = champ_data["passive"]["image"]["full"]
-            icon_spell_ids = [
-                spell_id["image"]["full"] for spell_id in champ_data["spells"]
-            ]
-
-            icon_champ_url = f"{self._base_url}cdn/{patch}/img/champion/{icon_champ_id}"
-            icon_passive_url = (
-                f"{self._base_url}cdn/{patch}/img/passive/{icon_passive_id}"
-            )
-            icon_spell_ids_url = [
-                f"{self._base_url}cdn/{patch}/img/spell/{spell_id}"
-                for spell_id in icon_spell_ids
-            ]
-
-            icons_dict = {
-                "champ_icon": icon_champ_url,
-                "passive_icon": icon_passive_url,
-            }
-
-            abilities = ("q", "w", "e", "r")
-            for spell_url, ability in zip(icon_spell_ids_url, abilities):
-                icons_dict[f"{ability}_icon"] = spell_url
-
             self._logger.info(f"✔️ Informazioni sulle icone di {champ_id} scaricate.")
-            champ_icons.append((champ_id, icons_dict))
+            champ_icons.append((champ_id, self._build_icons(patch, champ_data)))
 
         self._logger.info(f"✅ Icone scaricate .")
         return tuple(champ_icons)
@@ -311,23 +518,11 @@ class LeagueAPI:
         champ_skins = []
         for champ_id, champ_data in self._champions_data.items():
 
-            skin_ids = [{skin["num"]: skin["name"]} for skin in champ_data["skins"]]
-
             skins_dict = {}
-            for index, skin in enumerate(skin_ids):
-                for skin_id, skin_name in skin.items():
-                    if champ_id.lower() == "fiddlesticks":
-                        splash_url = f"{self._base_url}cdn/img/champion/splash/FiddleSticks_{skin_id}.jpg"
-                        loading_url = splash_url.replace("splash", "loading")
-                    else:
-                        splash_url = f"{self._base_url}cdn/img/champion/splash/{champ_id}_{skin_id}.jpg"
-                        loading_url = splash_url.replace("splash", "loading")
-
-                    skins_dict[str(index)] = {
-                        "name": skin_name,
-                        "splash": splash_url,
-                        "loading": loading_url,
-                    }
+            for index, (skin, urls) in enumerate(
+                zip(champ_data["skins"], self._build_skin_urls(champ_id, champ_data))
+            ):
+                skins_dict[str(index)] = {"name": skin["name"], **urls}
 
             self._logger.info(f"✔️ Informazioni sulle skin di {champ_id} scaricate.")
             champ_skins.append((champ_id, skins_dict))
@@ -342,11 +537,24 @@ class LeagueAPI:
 
 
 class Extract(LeagueAPI):
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self, max_workers: int = 16, language_workers: int = 4, offline: bool = False
+    ):
+        self._language_workers = max(1, language_workers)
+
+        # pool di connessioni condiviso tra tutte le lingue elaborate in parallelo
+        super().__init__(
+            max_workers=max_workers,
+            pool_maxsize=max(1, max_workers) * self._language_workers,
+            offline=offline,
+        )
         self._patch = self.get_versions(last_version=True)
         self._DATA_PATH = DATA_PATH
 
+        # Dati indipendenti dalla lingua, calcolati una sola volta
+        self._icons_cache: dict[tuple[str, str], dict[str, str]] = {}
+        self._skin_urls_cache: dict[tuple[str, str], tuple[dict[str, str]]] = {}
+
     # Metodo per scaricare le lingue, singola volta e solo se non esiste già un file
 
     def languages_to_json(self) -> str:
@@ -384,9 +592,9 @@ class Extract(LeagueAPI):
 
         return json_lang_path
 
-    def data_champs_to_json(self, countries: tuple[str]) -> None:
+    def _load_languages(self) -> dict[str, dict[str, str]]:
         """
-        Estrazione dati dei campioni ed esportazione in un file `JSON`
+        Restituisce il contenuto di `languages.json`, creandolo se non esiste.
         """
 
         self._logger.info("ℹ️ Caricamento JSON di informazioni sulle lingue in corso...")
@@ -394,89 +602,670 @@ class Extract(LeagueAPI):
             lang_data = loads(json_lang.read())
 
         self._logger.info("✅ Caricamento completato.")
+        return lang_data
 
-        champ_dict = {}
+    def _champ_json_path(self, lang_info: dict[str, str]) -> Path:
+        """
+        Restituisce il path del `JSON` dei campioni per la lingua indicata.
+        """
+
+        country = lang_info.get("country").replace(" ", "_").lower()
+        return self._DATA_PATH / "champ" / f"{country}_data.json"
+
+    def _shared_icons(
+        self, champ_id: str, champ_data: dict, patch: str = None
+    ) -> dict[str, str]:
+        """
+        Restituisce le icone del campione calcolandole una sola volta per tutte le lingue.
+        """
+
+        key = (patch or self._patch, champ_id)
+        if key not in self._icons_cache:
+            self._icons_cache[key] = self._build_icons(key[0], champ_data)
+        return self._icons_cache[key]
+
+    def _shared_skin_urls(
+        self, champ_id: str, champ_data: dict, patch: str = None
+    ) -> tuple[dict]:
+        """
+        Restituisce gli URL delle skin del campione calcolandoli una sola volta per tutte le lingue.
+        """
+
+        # le skin cambiano tra le patch: la chiave include la patch
+        key = (patch or self._patch, champ_id)
+        if key not in self._skin_urls_cache:
+            self._skin_urls_cache[key] = self._build_skin_urls(champ_id, champ_data)
+        return self._skin_urls_cache[key]
+
+    def _champ_to_dict(
+        self, champ_id: str, name_nickname: dict, champ_data: dict, patch: str = None
+    ) -> dict[str, Any]:
+        """
+        Restituisce il dizionario formattato di un campione, pronto per l'esportazione in `JSON`.
+
+        `patch` indica la patch da cui provengono i dati (di default l'ultima).
+        """
+
+        icons = self._shared_icons(champ_id, champ_data, patch)
+
+        champ = {
+            "name": name_nickname.get("name"),
+            "nickname": name_nickname.get("nickname"),
+            "icon": icons.get("champ_icon"),
+        }
+
+        abilities_dict = {}
+        for ability_name, info in self._build_abilities(champ_data).items():
+            abilities_dict[ability_name] = {
+                "name": info.get("name"),
+                "description": info.get("description"),
+                "icon": icons.get(f"{ability_name}_icon"),
+            }
+
+        champ["abilities"] = abilities_dict
+
+        # nomi delle skin localizzati + URL condivisi tra le lingue
+        skins_dict = {}
+        for index, (skin, urls) in enumerate(
+            zip(
+                champ_data["skins"],
+                self._shared_skin_urls(champ_id, champ_data, patch),
+            )
+        ):
+            skins_dict[index] = {
+                "name": skin.get("name"),
+                "splash": urls.get("splash"),
+                "loading": urls.get("loading"),
+            }
+
+        champ["skins"] = skins_dict
+
+        return champ
+
+    @staticmethod
+    def _detail_checksum(champ_data: dict) -> str:
+        """
+        Restituisce l'hash dei dati dettagliati di un campione (`champion/<id>.json`).
+
+        Copre abilità e skin; il campo `version` viene escluso perché cambia ad ogni patch anche se il campione è invariato.
+        """
+
+        content = {key: value for key, value in champ_data.items() if key != "version"}
+        return sha256(
+            dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def _roster_checksum(info: dict) -> str:
+        """
+        Restituisce l'hash dei dati riassuntivi di un campione in `champion.json` (`key`, nome, titolo, statistiche...).
+
+        Esclude `version`, uguale alla patch per tutti i campioni, e `image`, le cui coordinate nello sprite
+        cambiano quando viene aggiunto un campione.
+        """
+
+        content = {
+            key: value for key, value in info.items() if key not in ("version", "image")
+        }
+        return sha256(
+            dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    def _reuse_champ(self, champ: dict, old_patch: str) -> dict:
+        """
+        Aggiorna alla patch corrente gli URL delle icone di un campione già esportato e invariato.
+        """
+
+        old_segment = f"/cdn/{old_patch}/"
+        new_segment = f"/cdn/{self._patch}/"
+
+        champ["icon"] = champ["icon"].replace(old_segment, new_segment)
+        for ability in champ["abilities"].values():
+            ability["icon"] = ability["icon"].replace(old_segment, new_segment)
+
+        return champ
+
+    def _iter_champ_dicts(
+        self,
+        roster: dict[str, dict],
+        champions_data: Iterable[tuple[str, dict]],
+        checksums: dict[str, str],
+        existing: dict[str, dict],
+        meta: dict[str, Any] = None,
+    ) -> Iterable[tuple[str, dict]]:
+        """
+        Produce le coppie (id, dizionario formattato) nell'ordine di `roster`, una alla volta.
+
+        I campioni con dati dettagliati invariati rispetto a `meta`, o non scaricati (`champ_data` a `None`),
+        vengono ripresi da `existing`, gli altri ricostruiti; l'hash di ogni campione viene registrato in `checksums`.
+        """
+
+        for champ_id, champ_data in champions_data:
+            if champ_data is None:
+                checksums[champ_id] = meta["champions"][champ_id]
+                yield champ_id, self._reuse_champ(existing[champ_id], meta["patch"])
+                continue
+
+            checksum = checksums.get(champ_id) or self._detail_checksum(champ_data)
+            checksums[champ_id] = checksum
+
+            if (
+                meta
+                and champ_id in existing
+                and meta["champions"].get(champ_id) == checksum
+            ):
+                yield champ_id, self._reuse_champ(existing[champ_id], meta["patch"])
+            else:
+                info = roster[champ_id]
+                name_nickname = {"name": info["name"], "nickname": info["title"]}
+                yield champ_id, self._champ_to_dict(champ_id, name_nickname, champ_data)
+
+    def _language_to_json(
+        self,
+        lang_info: dict[str, str],
+        incremental: bool = False,
+        compact: bool = False,
+    ) -> Path:
+        """
+        Estrae i dati dei campioni in una singola lingua e li esporta in un file `JSON`.
+
+        La lista dei campioni viene scaricata una sola volta e riutilizzata per le abilità.
+
+        Con `incremental=True` i `JSON` dettagliati dei campioni vengono rivalidati tramite la cache
+        HTTP (`304` se invariati) e confrontati con gli hash del file `*_data.meta.json`: se patch e
+        hash coincidono il file esistente non viene riscritto, altrimenti vengono ricostruiti solo
+        i campioni modificati. Al cambio di patch vengono scaricati solo i dati dettagliati dei campioni
+        nuovi o con dati riassuntivi (`champion.json`) diversi da quelli salvati: gli altri non costano
+        alcuna richiesta. Skin o abilità cambiate senza modifiche ai dati riassuntivi vengono rilevate
+        dalla successiva esecuzione incrementale sulla stessa patch, che rivalida tutti i dettagli.
+
+        Ogni campione viene scritto nel file appena pronto, senza costruire l'intero dizionario in memoria.
+        """
+
+        lang_name = lang_info.get("language").lower()
+        code = lang_info.get("code")
+
+        json_champ_path = self._champ_json_path(lang_info)
+        json_meta_path = json_champ_path.with_suffix(".meta.json")
+
+        self._logger.info(f"ℹ️ Scaricando informazioni... ({lang_name})")
+
+        roster = self.get_roster(patch=self._patch, code_lang=code)
+
+        # Confronto con la patch da cui è stato generato il file esistente
+        meta, existing = None, {}
+        if incremental and json_champ_path.exists() and json_meta_path.exists():
+            with open(json_meta_path, "r", encoding="utf-8") as file:
+                meta = loads(file.read())
+            with open(json_champ_path, "r", encoding="utf-8") as file:
+                existing = loads(file.read())
+
+        roster_checksums = {
+            champ_id: self._roster_checksum(info) for champ_id, info in roster.items()
+        }
+
+        # dati dettagliati scaricati in parallelo, consumati appena disponibili
+        champions_data = self._iter_champions_data(self._patch, code, tuple(roster))
+        checksums: dict[str, str] = {}
+
+        if meta and meta["patch"] == self._patch:
+            # stessa patch: risposte rivalidate dalla cache, confronto prima di riscrivere
+            champions_data = tuple(champions_data)
+            checksums.update(
+                (champ_id, self._detail_checksum(champ_data))
+                for champ_id, champ_data in champions_data
+            )
+            changed = sum(
+                1
+                for champ_id, checksum in checksums.items()
+                if champ_id not in existing
+                or meta["champions"].get(champ_id) != checksum
+            )
+
+            if not changed and existing.keys() == checksums.keys():
+                self._logger.info(f"✅ JSON già aggiornato. ({lang_name})")
+                return json_champ_path
+
+            self._logger.info(f"ℹ️ {changed} campioni da aggiornare. ({lang_name})")
+        elif meta:
+            # nuova patch: dettagli solo per i campioni nuovi o con dati riassuntivi modificati
+            to_fetch = tuple(
+                champ_id
+                for champ_id, checksum in roster_checksums.items()
+                if champ_id not in existing
+                or champ_id not in meta["champions"]
+                or meta.get("roster", {}).get(champ_id) != checksum
+            )
+            fetched = self._iter_champions_data(self._patch, code, to_fetch)
+            champions_data = (
+                next(fetched) if champ_id in to_fetch else (champ_id, None)
+                for champ_id in roster
+            )
+
+            self._logger.info(
+                f"ℹ️ Patch {meta['patch']} -> {self._patch}: "
+                f"{len(to_fetch)} campioni da riscaricare. ({lang_name})"
+            )
+
+        self._logger.info(f"ℹ️ Creazione JSON... ({lang_name})")
+
+        write_json_stream(
+            json_champ_path,
+            self._iter_champ_dicts(roster, champions_data, checksums, existing, meta),
+            compact=compact,
+        )
+
+        write_json_stream(
+            json_meta_path,
+            {
+                "patch": self._patch,
+                "champions": checksums,
+                "roster": roster_checksums,
+            }.items(),
+        )
+
+        self._logger.info(f"✔️ Informazioni in ({lang_name}) scaricate.")
+        self._logger.info(f"ℹ️ JSON path: {json_champ_path}")
+        self._logger.info(f"✅ JSON creato. ({lang_name})")
+
+        return json_champ_path
+
+    def data_champs_to_json(
+        self, countries: tuple[str], incremental: bool = False, compact: bool = False
+    ) -> None:
+        """
+        Estrazione dati dei campioni ed esportazione in un file `JSON`
+
+        Le lingue vengono elaborate in parallelo (massimo `language_workers` contemporanee),
+        icone e URL delle skin vengono calcolati una sola volta per tutte le lingue.
+
+        Con `incremental=True` vengono aggiornati solo i campioni nuovi o modificati dall'ultima estrazione,
+        con `compact=True` il `JSON` viene scritto senza indentazione.
+        """
+
+        lang_data = self._load_languages()
 
         json_champ_folder = self._DATA_PATH / "champ"
         json_champ_folder.mkdir(exist_ok=True)
 
-        for lang in countries:
-            lang_name = lang_data[lang].get("language").lower()
-            country = lang_data[lang].get("country").replace(" ", "_").lower()
-            filename = f"{country}_data.json"
+        with ThreadPoolExecutor(max_workers=self._language_workers) as executor:
+            # consumo dei risultati per propagare eventuali eccezioni
+            tuple(
+                executor.map(
+                    lambda lang: self._language_to_json(
+                        lang_data[lang], incremental, compact
+                    ),
+                    countries,
+                )
+            )
+
+        stats = self.request_stats
+        self._logger.info(
+            f"ℹ️ Richieste: {stats.requests}, retry: {stats.retries}, "
+            f"fallite: {stats.failures}, tempo perso: {stats.wasted_time:.2f}s, "
+            f"attesa limite: {stats.throttled_time:.2f}s"
+        )
+
+    def _patch_to_history(
+        self, store: HistoryStore, lang_info: dict[str, str], patch: str
+    ) -> dict[str, str]:
+        """
+        Scarica i campioni di una patch in una lingua e li salva nello storico.
+        """
+
+        country = self._champ_json_path(lang_info).stem.removesuffix("_data")
+        code = lang_info.get("code")
+
+        roster = self.get_roster(patch=patch, code_lang=code)
+        champions = (
+            (
+                champ_id,
+                self._champ_to_dict(
+                    champ_id,
+                    {
+                        "name": roster[champ_id]["name"],
+                        "nickname": roster[champ_id]["title"],
+                    },
+                    champ_data,
+                    patch,
+                ),
+            )
+            for champ_id, champ_data in self._iter_champions_data(
+                patch, code, tuple(roster)
+            )
+        )
+
+        manifest = store.put(country, patch, champions)
+        self._logger.info(
+            f"✔️ Patch {patch} archiviata: {len(manifest)} campioni. ({country})"
+        )
+        return manifest
+
+    def backfill_history(
+        self,
+        countries: tuple[str],
+        patches: tuple[str] = None,
+        last: int = 10,
+        patch_workers: int = 2,
+    ) -> HistoryStore:
+        """
+        Archivia in `data/history` i dati dei campioni di più patch (di default le ultime `last`).
 
-            json_champ_path = json_champ_folder / filename
+        Le patch vengono elaborate in parallelo (massimo `patch_workers` contemporanee) e quelle
+        già archiviate vengono saltate. I campioni identici in più patch sono salvati una sola volta:
+        per sapere cosa è cambiato tra due patch basta `store.diff(paese, vecchia, nuova)`.
 
-            code = lang_data[lang].get("code")
+        Restituisce l'archivio.
+        """
 
-            self._logger.info(f"ℹ️ Scaricando informazioni... ({lang_name})")
+        store = HistoryStore(HISTORY_DIR)
+        lang_data = self._load_languages()
+
+        if patches is None:
+            patches = tuple(
+                patch for patch in self.get_versions() if PATCH_PATTERN.match(patch)
+            )[:last]
+
+        jobs = tuple(
+            (lang, patch)
+            for lang in countries
+            for patch in sorted(patches, key=patch_key)
+            if not store.has(
+                self._champ_json_path(lang_data[lang]).stem.removesuffix("_data"),
+                patch,
+            )
+        )
+        self._logger.info(
+            f"ℹ️ Storico: {len(jobs)} patch da archiviare "
+            f"({len(patches) * len(countries) - len(jobs)} già presenti)."
+        )
 
-            champions = self.get_champions(patch=self._patch, code_lang=code)
-            # tupla con solo id dei campioni
-            champ_ids = tuple([element[0] for element in champions])
-            # tupla con dict dei nomi, chiavi -> (name, nickname)
-            champ_name_nickname = tuple([element[1] for element in champions])
+        def archive(job: tuple[str, str]) -> None:
+            lang, patch = job
+            try:
+                self._patch_to_history(store, lang_data[lang], patch)
+            except Exception as e:
+                # una patch non disponibile non blocca le altre
+                self._logger.error(f"⚠️ Patch {patch} non archiviata ({lang}): {e}")
 
-            abilities = self.get_abilities(patch=self._patch, code_lang=code)
-            # tupla con dict delle abilità, chiavi -> (passive, q, w, e, r)
-            # ogni chiave ha sottochiavi -> (name, description)
-            champ_abilities = tuple([element[1] for element in abilities])
+        with ThreadPoolExecutor(max_workers=max(1, patch_workers)) as executor:
+            tuple(executor.map(archive, jobs))
 
-            icons = self.get_icons(patch=self._patch)
-            # tupla con dict delle icone
-            # chiavi -> (champ_icon, passive_icon, q_icon, w_icon, e_icon, r_icon)
-            champ_icons = tuple([element[1] for element in icons])
+        objects, size = store.size()
+        self._logger.info(
+            f"✅ Storico aggiornato: {objects} oggetti, {size / 1024 / 1024:.1f} MB"
+        )
+        return store
 
-            skins = self.get_skins()
-            # tupla con tuple di dict delle skins
-            # chiavi di ogni dict -> (name, splash, loading)
-            champ_skins = tuple([tuple(element[1].values()) for element in skins])
+    @staticmethod
+    def _image_fields(champ: dict) -> Iterable[tuple[dict, str]]:
+        """
+        Produce le coppie (dizionario, chiave) di tutti i campi immagine di un campione.
+        """
 
-            self._logger.info(f"✔️ Informazioni in ({lang_name}) scaricate.")
+        yield champ, "icon"
+        for ability in champ["abilities"].values():
+            yield ability, "icon"
+        for skin in champ["skins"].values():
+            yield skin, "splash"
+            yield skin, "loading"
+
+    def mirror_assets(
+        self,
+        countries: tuple[str],
+        local_prefix: str = "assets/",
+        compact: bool = False,
+        revalidate: bool = False,
+    ) -> MirrorStats:
+        """
+        Scarica in `data/assets` icone, splash e loading dei `JSON` delle lingue indicate
+        e sostituisce nei file gli URL del CDN con percorsi locali (`local_prefix` + percorso del CDN).
 
-            self._logger.info(f"ℹ️ Creazione JSON... ({lang_name})")
+        Le immagini già presenti non vengono riscaricate (con `revalidate=True` splash e loading
+        vengono ricontrollate con richieste condizionali); se un download fallisce il relativo URL
+        resta quello del CDN. Va eseguito dopo `data_champs_to_json`.
+        """
 
-            # creare dict formattato per esportarlo in JSON
-            for id, name_nickname, abilities, icons, skins in zip(
-                champ_ids,
-                champ_name_nickname,
-                champ_abilities,
-                champ_icons,
-                champ_skins,
-            ):
+        lang_data = self._load_languages()
+        json_paths = tuple(self._champ_json_path(lang_data[lang]) for lang in countries)
+
+        mirror = AssetMirror(
+            self._scheduler,
+            ASSETS_DIR,
+            self._base_url,
+            self._logger,
+            max_workers=self._max_workers,
+            revalidate=revalidate,
+        )
+
+        def to_remote(value: str) -> str:
+            # i file già riscritti contengono percorsi locali
+            if value.startswith(local_prefix):
+                return self._base_url + value[len(local_prefix) :]
+            return value
+
+        def iter_urls():
+            for json_path in json_paths:
+                with open(json_path, "r", encoding="utf-8") as file:
+                    champions = loads(file.read())
+                for champ in champions.values():
+                    for container, key in self._image_fields(champ):
+                        yield to_remote(container[key])
+
+        stats = mirror.mirror(iter_urls())
+
+        def iter_local(champions: dict[str, dict]):
+            for champ_id, champ in champions.items():
+                for container, key in self._image_fields(champ):
+                    relative = mirror.relative_path(to_remote(container[key]))
+                    if (ASSETS_DIR / relative).exists():
+                        container[key] = local_prefix + relative
+                yield champ_id, champ
+
+        for json_path in json_paths:
+            with open(json_path, "r", encoding="utf-8") as file:
+                champions = loads(file.read())
+
+            write_json_stream(json_path, iter_local(champions), compact=compact)
+            self._logger.info(f"✅ URL delle immagini aggiornati in: {json_path}")
+
+        return stats
+
+    def build_card_images(
+        self,
+        countries: tuple[str],
+        local_prefix: str = "assets/",
+        workers: int = None,
+        compact: bool = False,
+    ) -> int:
+        """
+        Crea versioni ridotte delle splash (AVIF/WebP se supportati da Pillow, JPEG sempre)
+        in `data/assets/cards` e aggiunge ad ogni skin dei `JSON` il campo `srcset`:
+        un dizionario MIME -> valore pronto per l'attributo `srcset` di `<source>`.
+
+        Le immagini vengono elaborate in parallelo in `workers` processi (default: numero di CPU).
+        Va eseguito dopo `mirror_assets`, le splash non scaricate in locale vengono ignorate.
+
+        Restituisce il numero di splash elaborate.
+        """
 
-                champ_dict[id] = {
-                    "name": name_nickname.get("name"),
-                    "nickname": name_nickname.get("nickname"),
-                    "icon": icons.get("champ_icon"),
+        lang_data = self._load_languages()
+        json_paths = tuple(self._champ_json_path(lang_data[lang]) for lang in countries)
+
+        def local_source(splash: str) -> Path | None:
+            if not splash.startswith(local_prefix):
+                return None
+            source = ASSETS_DIR / splash[len(local_prefix) :]
+            return source if source.exists() else None
+
+        # splash locali senza duplicati tra le lingue
+        sources = {}
+        for json_path in json_paths:
+            with open(json_path, "r", encoding="utf-8") as file:
+                champions = loads(file.read())
+            for champ in champions.values():
+                for skin in champ["skins"].values():
+                    source = local_source(skin["splash"])
+                    if source:
+                        sources[skin["splash"]] = source
+                    else:
+                        self._logger.warning(
+                            f"⚠️ Splash non presente in locale: {skin['splash']}"
+                        )
+
+        formats = available_formats()
+        self._logger.info(
+            f"ℹ️ Creazione versioni ridotte di {len(sources)} splash "
+            f"({', '.join(mime for _, _, mime in formats)})..."
+        )
+
+        # calcolo in processi separati (ridimensionamento e codifica usano la CPU)
+        srcsets = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            derivatives = executor.map(
+                make_derivatives,
+                sources.values(),
+                repeat(CARDS_DIR),
+                repeat(CARD_WIDTHS),
+                repeat(formats),
+                chunksize=8,
+            )
+            for splash, results in zip(sources, derivatives):
+                srcset = {}
+                for mime, width, path in results:
+                    local = local_prefix + path.relative_to(ASSETS_DIR).as_posix()
+                    srcset.setdefault(mime, []).append(f"{local} {width}w")
+                srcsets[splash] = {
+                    mime: ", ".join(entries) for mime, entries in srcset.items()
                 }
 
-                abilities_dict = {}
-                for ability_name, info in abilities.items():
-                    abilities_dict[ability_name] = {
-                        "name": info.get("name"),
-                        "description": info.get("description"),
-                        "icon": icons.get(f"{ability_name}_icon"),
-                    }
+        def iter_with_srcset(champions: dict[str, dict]):
+            for champ_id, champ in champions.items():
+                for skin in champ["skins"].values():
+                    if skin["splash"] in srcsets:
+                        skin["srcset"] = srcsets[skin["splash"]]
+                yield champ_id, champ
+
+        for json_path in json_paths:
+            with open(json_path, "r", encoding="utf-8") as file:
+                champions = loads(file.read())
+
+            write_json_stream(json_path, iter_with_srcset(champions), compact=compact)
+            self._logger.info(f"✅ Versioni ridotte aggiunte in: {json_path}")
+
+        return len(srcsets)
+
+    def shard_champs(self, countries: tuple[str], compact: bool = True) -> tuple[Path]:
+        """
+        Divide i `JSON` delle lingue indicate in un indice leggero (`<paese>/index.json`)
+        e un file per ogni campione (`<paese>/champions/<id>.json`) caricabile su richiesta.
+
+        Va eseguito dopo `data_champs_to_json` (ed eventualmente `mirror_assets` / `build_card_images`).
+        Restituisce i path degli indici creati.
+        """
+
+        lang_data = self._load_languages()
 
-                champ_dict[id]["abilities"] = abilities_dict
+        index_paths = []
+        for lang in countries:
+            json_path = self._champ_json_path(lang_data[lang])
+            target_dir = json_path.parent / json_path.stem.removesuffix("_data")
+
+            index_paths.append(write_shards(json_path, target_dir, compact=compact))
+            self._logger.info(f"✅ Indice e file dei campioni creati in: {target_dir}")
 
-                skins_dict = {}
-                for index, skin in enumerate(skins):
-                    skins_dict[index] = {
-                        "name": skin.get("name"),
-                        "splash": skin.get("splash"),
-                        "loading": skin.get("loading"),
-                    }
+        return tuple(index_paths)
+
+    def search_index_to_json(self, countries: tuple[str]) -> tuple[Path]:
+        """
+        Crea accanto ai `JSON` delle lingue indicate l'indice di ricerca `<paese>_search.json`
+        (nomi, nickname, nomi e descrizioni delle abilità), usato dall'endpoint `/api/search` del backend.
 
-                champ_dict[id]["skins"] = skins_dict
+        Va eseguito dopo `data_champs_to_json`. Restituisce i path degli indici creati.
+        """
+
+        lang_data = self._load_languages()
+
+        index_paths = []
+        for lang in countries:
+            json_path = self._champ_json_path(lang_data[lang])
+            index_path = json_path.with_name(
+                json_path.name.replace("_data.json", "_search.json")
+            )
+
+            with open(json_path, "r", encoding="utf-8") as file:
+                index = build_search_index(loads(file.read()))
+
+            index_paths.append(
+                write_json_stream(index_path, index.items(), compact=True)
+            )
+            self._logger.info(
+                f"✅ Indice di ricerca creato: {index_path} ({len(index['terms'])} termini)"
+            )
+
+        return tuple(index_paths)
+
+    def champs_to_pack(self, countries: tuple[str]) -> tuple[Path]:
+        """
+        Crea accanto ai `JSON` delle lingue indicate la versione binaria `<paese>_data.pack`:
+        stringhe salvate una sola volta, prefissi degli URL fattorizzati e un indice per leggere
+        un singolo campione dal file mappato in memoria (vedi `packing.py`).
+
+        Va eseguito dopo `data_champs_to_json`. Restituisce i path dei file creati.
+        """
+
+        lang_data = self._load_languages()
+
+        pack_paths = []
+        for lang in countries:
+            json_path = self._champ_json_path(lang_data[lang])
+            pack_path = json_path.with_suffix(".pack")
+
+            with open(json_path, "r", encoding="utf-8") as file:
+                write_pack(loads(file.read()), pack_path, patch=self._patch)
+
+            pack_paths.append(pack_path)
+            self._logger.info(
+                f"✅ Pack creato: {pack_path} ({pack_path.stat().st_size / 1024:.0f} KB, "
+                f"JSON {json_path.stat().st_size / 1024:.0f} KB)"
+            )
+
+        return tuple(pack_paths)
+
+    def build_release(self, countries: tuple[str]) -> Path:
+        """
+        Prepara in `data/build` i `JSON` delle lingue indicate (file completo, indice e file
+        dei campioni, indice di ricerca se presenti) minificati, con l'hash del contenuto
+        nel nome e precompressi in gzip e brotli, più un `manifest.json` nome logico -> nome con hash.
+
+        Va eseguito dopo `data_champs_to_json` (ed eventualmente `shard_champs`).
+        Restituisce il path del manifest.
+        """
+
+        lang_data = self._load_languages()
+        json_champ_folder = self._DATA_PATH / "champ"
+
+        sources = []
+        for lang in countries:
+            json_path = self._champ_json_path(lang_data[lang])
+            shard_dir = json_path.parent / json_path.stem.removesuffix("_data")
+
+            sources.append(json_path)
+
+            search_path = json_path.with_name(
+                json_path.name.replace("_data.json", "_search.json")
+            )
+            if search_path.exists():
+                sources.append(search_path)
+            if (shard_dir / "index.json").exists():
+                sources.append(shard_dir / "index.json")
+                sources.extend(sorted((shard_dir / "champions").glob("*.json")))
 
-            if not json_champ_path.exists():
-                with open(json_champ_path, "w", encoding="utf-8") as file:
-                    dump(champ_dict, file, indent=4, ensure_ascii=False)
+        self._logger.info(f"ℹ️ Preparazione di {len(sources)} file in {BUILD_DIR}...")
+        manifest_path = build_release(sources, json_champ_folder, BUILD_DIR)
+        self._logger.info(f"✅ Manifest creato: {manifest_path}")
 
-            self._logger.info(f"ℹ️ JSON path: {json_champ_path}")
-            self._logger.info(f"✅ JSON creato. ({lang_name})")
+        return manifest_path
 
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+from json import loads, dumps
+from pathlib import Path
+from hashlib import sha256
+from tempfile import NamedTemporaryFile
+from typing import Iterable
+
+import os
+import re
+
+
+# ============================================
+# ============  HISTORY STORE  ===============
+# ============================================
+
+# Segmento della patch negli URL di Data Dragon, sostituito da un segnaposto prima del salvataggio:
+# un campione invariato produce lo stesso oggetto in ogni patch
+_PATCH_SEGMENT = re.compile(r"/cdn/\d+\.\d+\.\d+/")
+_PLACEHOLDER = "/cdn/{patch}/"
+
+# Versioni "normali" (es. `15.24.1`); le più vecchie hanno nomi e formati diversi
+PATCH_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
+
+
+def patch_key(patch: str) -> tuple[int, ...]:
+    """
+    Chiave di ordinamento di una patch (`15.9.1` < `15.10.1`).
+    """
+
+    return tuple(int(part) for part in patch.split("."))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+        file.write(data)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+
+
+class HistoryStore:
+    """
+    Archivio dei dati dei campioni di più patch con deduplicazione dei contenuti.
+
+    - `objects/<xx>/<sha256>.json`: un campione (URL senza patch), salvato una sola volta
+      anche se identico in decine di patch;
+    - `manifests/<paese>/<patch>.json`: id del campione -> hash dell'oggetto.
+
+    Lo spazio occupato cresce con i campioni effettivamente modificati, non con il numero
+    di patch; il confronto tra due patch legge solo i due manifest.
+    """
+
+    def __init__(self, folder: Path):
+        self._folder = folder
+        self._objects = folder / "objects"
+        self._manifests = folder / "manifests"
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / f"{digest}.json"
+
+    def _manifest_path(self, country: str, patch: str) -> Path:
+        return self._manifests / country / f"{patch}.json"
+
+    def put_object(self, champ: dict) -> str:
+        """
+        Salva un campione (se non già presente) e ne restituisce l'hash.
+        """
+
+        content = _PATCH_SEGMENT.sub(
+            _PLACEHOLDER,
+            dumps(champ, separators=(",", ":"), ensure_ascii=False),
+        ).encode("utf-8")
+        digest = sha256(content).hexdigest()
+
+        path = self._object_path(digest)
+        if not path.exists():
+            _atomic_write(path, content)
+
+        return digest
+
+    def get_object(self, digest: str, patch: str) -> dict:
+        """
+        Legge un campione riportando gli URL alla patch indicata.
+        """
+
+        content = self._object_path(digest).read_text(encoding="utf-8")
+        return loads(content.replace(_PLACEHOLDER, f"/cdn/{patch}/"))
+
+    def put(
+        self, country: str, patch: str, champions: Iterable[tuple[str, dict]]
+    ) -> dict[str, str]:
+        """
+        Salva i campioni di una patch e ne scrive il manifest (per ultimo: un manifest
+        presente indica sempre una patch completa). Restituisce il manifest.
+        """
+
+        manifest = {champ_id: self.put_object(champ) for champ_id, champ in champions}
+        _atomic_write(
+            self._manifest_path(country, patch),
+            dumps({"patch": patch, "champions": manifest}, ensure_ascii=False).encode(
+                "utf-8"
+            ),
+        )
+        return manifest
+
+    def has(self, country: str, patch: str) -> bool:
+        return self._manifest_path(country, patch).exists()
+
+    def patches(self, country: str) -> tuple[str]:
+        """
+        Restituisce le patch archiviate per il paese, dalla più vecchia alla più recente.
+        """
+
+        folder = self._manifests / country
+        if not folder.exists():
+            return ()
+        return tuple(
+            sorted((path.stem for path in folder.glob("*.json")), key=patch_key)
+        )
+
+    def manifest(self, country: str, patch: str) -> dict[str, str]:
+        """
+        Restituisce id del campione -> hash dell'oggetto per la patch indicata.
+        """
+
+        path = self._manifest_path(country, patch)
+        if not path.exists():
+            raise KeyError(f"Patch {patch} non archiviata per: {country}")
+        return loads(path.read_text(encoding="utf-8"))["champions"]
+
+    def get(self, country: str, patch: str, champ_id: str) -> dict:
+        """
+        Restituisce i dati di un campione in una patch.
+        """
+
+        return self.get_object(self.manifest(country, patch)[champ_id], patch)
+
+    def iter_patch(self, country: str, patch: str) -> Iterable[tuple[str, dict]]:
+        """
+        Produce le coppie (id, dati) di tutti i campioni di una patch.
+        """
+
+        for champ_id, digest in self.manifest(country, patch).items():
+            yield champ_id, self.get_object(digest, patch)
+
+    def diff(self, country: str, old_patch: str, new_patch: str) -> dict[str, tuple]:
+        """
+        Restituisce i campioni aggiunti, rimossi e modificati tra due patch.
+
+        Il confronto usa solo gli hash dei manifest, senza leggere gli oggetti.
+        """
+
+        old = self.manifest(country, old_patch)
+        new = self.manifest(country, new_patch)
+
+        return {
+            "added": tuple(champ_id for champ_id in new if champ_id not in old),
+            "removed": tuple(champ_id for champ_id in old if champ_id not in new),
+            "changed": tuple(
+                champ_id
+                for champ_id, digest in new.items()
+                if champ_id in old and old[champ_id] != digest
+            ),
+        }
+
+    def history(self, country: str, champ_id: str) -> tuple[str]:
+        """
+        Restituisce le patch in cui il campione è stato introdotto o modificato.
+        """
+
+        changes, previous = [], None
+        for patch in self.patches(country):
+            digest = self.manifest(country, patch).get(champ_id)
+            if digest and digest != previous:
+                changes.append(patch)
+            previous = digest
+        return tuple(changes)
+
+    def size(self) -> tuple[int, int]:
+        """
+        Restituisce il numero di oggetti e i byte occupati dall'archivio.
+        """
+
+        files = [path for path in self._folder.rglob("*.json") if path.is_file()]
+        objects = sum(1 for path in files if self._objects in path.parents)
+        return objects, sum(path.stat().st_size for path in files)
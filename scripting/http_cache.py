@@ -0,0 +1,213 @@
+from json import loads, dumps
+from pathlib import Path
+from hashlib import sha256
+from dataclasses import dataclass
+from tempfile import NamedTemporaryFile
+
+import os
+import threading
+
+import requests
+
+
+# ============================================
+# ===========  HTTP RESPONSE CACHE  ==========
+# ============================================
+
+
+class CacheMissError(requests.RequestException):
+    """
+    Sollevata in modalità offline quando l'URL richiesto non è presente in cache.
+    """
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    Metadati di una risposta salvata: URL, hash del contenuto e header di validazione.
+    """
+
+    url: str
+    digest: str
+    size: int
+    etag: str = None
+    last_modified: str = None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Scrive `data` in un file temporaneo nella stessa cartella e lo rinomina su `path`.
+    """
+
+    with NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)
+
+
+class ResponseCache:
+    """
+    Cache su disco delle risposte HTTP, indicizzata per URL.
+
+    I contenuti sono salvati per hash (`objects/<sha256>`), quindi risposte identiche
+    occupano spazio una sola volta; i metadati di ogni URL (`entries/<sha256 url>.json`)
+    conservano `ETag` e `Last-Modified` per le richieste condizionali.
+
+    Superato `max_size` (byte) vengono eliminate le voci usate meno di recente (LRU).
+    """
+
+    def __init__(self, folder: Path, max_size: int = 256 * 1024 * 1024):
+        self._objects = folder / "objects"
+        self._entries = folder / "entries"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._entries.mkdir(parents=True, exist_ok=True)
+
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        # url -> (entry, ultimo accesso)
+        self._index: dict[str, tuple[CacheEntry, float]] = {}
+        # hash contenuto -> numero di URL che lo usano
+        self._refs: dict[str, int] = {}
+        self._size = 0
+
+        self._load()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return sha256(url.encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        """
+        Ricostruisce l'indice in memoria dai metadati presenti su disco.
+        """
+
+        for meta_path in self._entries.glob("*.json"):
+            try:
+                entry = CacheEntry(**loads(meta_path.read_text(encoding="utf-8")))
+            except (ValueError, TypeError):
+                meta_path.unlink(missing_ok=True)
+                continue
+
+            if not (self._objects / entry.digest).exists():
+                meta_path.unlink(missing_ok=True)
+                continue
+
+            self._index[entry.url] = (entry, meta_path.stat().st_mtime)
+            self._add_ref(entry)
+
+    def _add_ref(self, entry: CacheEntry) -> None:
+        if not self._refs.get(entry.digest):
+            self._size += entry.size
+        self._refs[entry.digest] = self._refs.get(entry.digest, 0) + 1
+
+    def _drop_ref(self, entry: CacheEntry) -> None:
+        self._refs[entry.digest] -= 1
+        if not self._refs[entry.digest]:
+            del self._refs[entry.digest]
+            (self._objects / entry.digest).unlink(missing_ok=True)
+            self._size -= entry.size
+
+    @property
+    def size(self) -> int:
+        """
+        Spazio occupato su disco dai contenuti in cache (byte).
+        """
+
+        return self._size
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """
+        Restituisce i metadati salvati per `url`, `None` se assente.
+        """
+
+        with self._lock:
+            cached = self._index.get(url)
+            return cached[0] if cached else None
+
+    def conditional_headers(self, entry: CacheEntry | None) -> dict[str, str]:
+        """
+        Restituisce gli header `If-None-Match` / `If-Modified-Since` per rivalidare `entry`.
+        """
+
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read(self, entry: CacheEntry) -> bytes | None:
+        """
+        Legge il contenuto di `entry` e la segna come usata di recente.
+        Restituisce `None` se il contenuto è stato eliminato nel frattempo (es. da `_evict`).
+        """
+
+        # Lettura sotto lock: `store` in un altro thread non può eliminare il file a metà
+        with self._lock:
+            try:
+                body = (self._objects / entry.digest).read_bytes()
+            except FileNotFoundError:
+                return None
+
+            if entry.url in self._index:
+                self._index[entry.url] = (entry, self._touch(entry.url))
+            return body
+
+    def _touch(self, url: str) -> float:
+        meta_path = self._entries / f"{self._key(url)}.json"
+        try:
+            os.utime(meta_path)
+            return meta_path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def store(
+        self, url: str, body: bytes, etag: str = None, last_modified: str = None
+    ) -> CacheEntry:
+        """
+        Salva la risposta di `url` ed elimina le voci meno recenti oltre `max_size`.
+        """
+
+        digest = sha256(body).hexdigest()
+        entry = CacheEntry(
+            url=url,
+            digest=digest,
+            size=len(body),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+        object_path = self._objects / digest
+        meta_path = self._entries / f"{self._key(url)}.json"
+
+        # Scritture sotto lock: `_evict` in un altro thread potrebbe eliminare i file appena scritti
+        with self._lock:
+            if not object_path.exists():
+                _atomic_write(object_path, body)
+            _atomic_write(meta_path, dumps(entry.__dict__).encode("utf-8"))
+
+            previous = self._index.get(url)
+            self._index[url] = (entry, meta_path.stat().st_mtime)
+            self._add_ref(entry)
+            if previous:
+                self._drop_ref(previous[0])
+
+            self._evict()
+
+        return entry
+
+    def _evict(self) -> None:
+        """
+        Elimina le voci usate meno di recente finché la cache non rientra in `max_size`.
+        """
+
+        if self._size <= self._max_size:
+            return
+
+        for url, (entry, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._size <= self._max_size:
+                break
+
+            del self._index[url]
+            (self._entries / f"{self._key(url)}.json").unlink(missing_ok=True)
+            self._drop_ref(entry)
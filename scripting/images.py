@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import os
+
+from PIL import Image, features
+
+
+# ============================================
+# ========  RESPONSIVE DERIVATIVES  ==========
+# ============================================
+
+# Larghezze delle versioni ridotte per le card (px)
+CARD_WIDTHS = (320, 640, 960)
+
+# Formati in ordine di preferenza per il browser: estensione, formato Pillow, MIME
+CARD_FORMATS = (
+    ("avif", "AVIF", "image/avif"),
+    ("webp", "WEBP", "image/webp"),
+    ("jpg", "JPEG", "image/jpeg"),
+)
+
+
+def available_formats() -> tuple[tuple[str, str, str]]:
+    """
+    Restituisce i formati di `CARD_FORMATS` supportati dall'installazione di Pillow.
+    """
+
+    return tuple(
+        (extension, pil_format, mime)
+        for extension, pil_format, mime in CARD_FORMATS
+        if pil_format == "JPEG" or features.check(extension)
+    )
+
+
+def make_derivatives(
+    source: Path,
+    target_dir: Path,
+    widths: tuple[int] = CARD_WIDTHS,
+    formats: tuple[tuple[str, str, str]] = None,
+    quality: int = 70,
+) -> tuple[tuple[str, int, Path]]:
+    """
+    Crea le versioni ridotte di `source` in `target_dir` per ogni larghezza e formato.
+
+    Le versioni più recenti del file sorgente non vengono rigenerate; larghezze maggiori
+    dell'originale vengono ignorate. Restituisce le tuple (MIME, larghezza, path) prodotte.
+
+    Pensata per essere eseguita in un processo separato (argomenti e risultato serializzabili).
+    """
+
+    formats = formats or available_formats()
+    source_mtime = source.stat().st_mtime
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    with Image.open(source) as original:
+        image = original.convert("RGB")
+
+        for width in widths:
+            if width > image.width:
+                continue
+
+            height = round(image.height * width / image.width)
+            resized = None
+
+            for extension, pil_format, mime in formats:
+                target = target_dir / f"{source.stem}-{width}.{extension}"
+
+                if not target.exists() or target.stat().st_mtime < source_mtime:
+                    resized = resized or image.resize((width, height), Image.LANCZOS)
+
+                    # scrittura su file temporaneo + rename
+                    temporary = target.with_name(f"{target.name}.tmp")
+                    resized.save(temporary, pil_format, quality=quality)
+                    os.replace(temporary, target)
+
+                results.append((mime, width, target))
+
+    return tuple(results)
@@ -0,0 +1,56 @@
+from json import dumps
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Iterable
+
+import os
+
+
+# ============================================
+# ==============  JSON WRITER  ===============
+# ============================================
+
+
+def write_json_stream(
+    path: Path, items: Iterable[tuple[str, Any]], compact: bool = False
+) -> Path:
+    """
+    Scrive un oggetto `JSON` chiave per chiave man mano che `items` produce le coppie (chiave, valore).
+
+    Il risultato è identico a `dump(dict(items), indent=4, ensure_ascii=False)`, oppure senza
+    spazi con `compact=True`. La scrittura è atomica: file temporaneo nella stessa cartella + rename.
+    """
+
+    if compact:
+        opening, separator, closing, colon = "{", ",", "}", ":"
+        options = {"separators": (",", ":"), "ensure_ascii": False}
+    else:
+        opening, separator, closing, colon = "{\n    ", ",\n    ", "\n}", ": "
+        options = {"indent": 4, "ensure_ascii": False}
+
+    with NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as file:
+        try:
+            empty = True
+            for key, value in items:
+                file.write(opening if empty else separator)
+                empty = False
+
+                entry = (
+                    f"{dumps(key, ensure_ascii=False)}{colon}{dumps(value, **options)}"
+                )
+                # indentazione annidata di un livello rispetto all'oggetto principale
+                file.write(entry if compact else entry.replace("\n", "\n    "))
+
+            file.write("{}" if empty else closing)
+
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+
+    # permessi standard (il file temporaneo nasce leggibile solo dal proprietario)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+    return path
@@ -0,0 +1,303 @@
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from collections import Counter
+from typing import Any, Iterator, KeysView
+from array import array
+
+import mmap
+import os
+import struct
+import sys
+
+import msgspec
+
+
+# ============================================
+# ============  CHAMPION PACK  ===============
+# ============================================
+
+# Formato binario `<paese>_data.pack`, in little-endian:
+#
+#   header      HEADER
+#   meta        msgpack {"patch", "prefixes"}
+#   stringhe    offset u32 [n + 1] | prefisso u16 [n] (+ padding a 4 byte) | testo UTF-8
+#   indice      (id stringa u32, offset u32, lunghezza u32) per campione, nell'ordine del `JSON`
+#   record      msgpack di ogni campione: chiavi e stringhe sono indici della tabella delle stringhe,
+#               liste, `None`, booleani e float restano nativi, gli interi sono ext `INT_EXT`
+#               (little-endian con segno) per distinguerli dagli indici
+#
+# Ogni stringa compare una sola volta; gli URL sono divisi in prefisso (es.
+# `https://ddragon.leagueoflegends.com/cdn/15.24.1/img/spell/`, patch inclusa) e nome del file,
+# con i prefissi salvati una volta sola nel meta. Il prefisso 0 indica "nessun prefisso".
+
+MAGIC = b"LCHP"
+# 1: solo dizionari e stringhe; 2: anche liste, numeri, booleani e `None`
+VERSION = 2
+INT_EXT = 1
+
+# magic, versione, flag, meta (offset, lunghezza), stringhe (numero, offset), campioni (numero, offset)
+HEADER = struct.Struct("<4sHHIIIIII")
+INDEX_ENTRY = struct.Struct("<III")
+
+
+class _StringTable:
+    """
+    Assegna un indice a ogni stringa distinta, nell'ordine in cui viene incontrata.
+    """
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.ids)
+        return index
+
+
+def _encode(value: Any, strings: _StringTable, path: str = "") -> Any:
+    """
+    Sostituisce ricorsivamente chiavi e stringhe con il loro indice nella tabella.
+
+    Gli interi diventano ext `INT_EXT`, gli altri valori `JSON` restano invariati;
+    qualsiasi altro tipo viene rifiutato indicando dove si trova.
+    """
+
+    if isinstance(value, str):
+        return strings.add(value)
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Chiave non supportata nel pack in {path}: {key!r}")
+            encoded[strings.add(key)] = _encode(item, strings, f"{path}/{key}")
+        return encoded
+    if isinstance(value, (list, tuple)):
+        return [
+            _encode(item, strings, f"{path}/{position}")
+            for position, item in enumerate(value)
+        ]
+    if value is None or isinstance(value, (bool, float)):
+        return value
+    if isinstance(value, int):
+        size = (value + (value < 0)).bit_length() // 8 + 1
+        return msgspec.msgpack.Ext(INT_EXT, value.to_bytes(size, "little", signed=True))
+    raise TypeError(f"Valore non supportato nel pack in {path}: {type(value).__name__}")
+
+
+def _split_prefixes(strings: list[str]) -> tuple[list[str], list[int], list[str]]:
+    """
+    Restituisce prefissi, indice del prefisso e parte restante di ogni stringa.
+
+    Vengono fattorizzati solo i percorsi (fino all'ultima `/`) condivisi da più stringhe.
+    """
+
+    def prefix_of(value: str) -> str:
+        return (
+            value[: value.rfind("/") + 1]
+            if "://" in value or value.startswith("assets/")
+            else ""
+        )
+
+    counts = Counter(prefix_of(value) for value in strings)
+    prefixes = [""] + [
+        prefix for prefix, count in counts.most_common(0xFFFF) if prefix and count > 1
+    ]
+    prefix_ids = {prefix: index for index, prefix in enumerate(prefixes)}
+
+    ids, rests = [], []
+    for value in strings:
+        prefix = prefix_of(value)
+        index = prefix_ids.get(prefix, 0)
+        ids.append(index)
+        rests.append(value[len(prefix) :] if index else value)
+
+    return prefixes, ids, rests
+
+
+def write_pack(champions: dict, path: Path, patch: str = None) -> Path:
+    """
+    Scrive i campioni nel formato `pack` (file temporaneo + rename). Restituisce il path.
+    """
+
+    strings = _StringTable()
+    records = [
+        (
+            strings.add(champ_id),
+            msgspec.msgpack.encode(_encode(champ, strings, champ_id)),
+        )
+        for champ_id, champ in champions.items()
+    ]
+
+    prefixes, prefix_ids, rests = _split_prefixes(list(strings.ids))
+    meta = msgspec.msgpack.encode({"patch": patch, "prefixes": prefixes})
+
+    # tabella delle stringhe
+    encoded = [rest.encode("utf-8") for rest in rests]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    table = bytearray()
+    table += struct.pack(f"<{len(offsets)}I", *offsets)
+    table += struct.pack(f"<{len(prefix_ids)}H", *prefix_ids)
+    table += b"\0" * (-len(table) % 4)
+    table += b"".join(encoded)
+
+    meta_offset = HEADER.size
+    strings_offset = meta_offset + len(meta)
+    index_offset = strings_offset + len(table)
+
+    index = bytearray()
+    record_offset = index_offset + INDEX_ENTRY.size * len(records)
+    for string_id, record in records:
+        index += INDEX_ENTRY.pack(string_id, record_offset, len(record))
+        record_offset += len(record)
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        meta_offset,
+        len(meta),
+        len(encoded),
+        strings_offset,
+        len(records),
+        index_offset,
+    )
+
+    with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+        try:
+            file.write(header)
+            file.write(meta)
+            file.write(table)
+            file.write(index)
+            for _, record in records:
+                file.write(record)
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+    return path
+
+
+class PackReader:
+    """
+    Lettura di un file `pack` mappato in memoria, usata anche dal backend.
+
+    All'apertura vengono letti solo header, prefissi e indice dei campioni: `get` decodifica
+    il solo record richiesto e le stringhe che usa, senza leggere il resto del file.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            version,
+            _,
+            meta_offset,
+            meta_size,
+            self._string_count,
+            strings_offset,
+            champ_count,
+            index_offset,
+        ) = HEADER.unpack_from(self._map)
+
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"File non valido o versione non supportata: {path}")
+
+        meta = msgspec.msgpack.decode(self._map[meta_offset : meta_offset + meta_size])
+        self.patch: str | None = meta["patch"]
+        self._prefixes: list[str] = meta["prefixes"]
+
+        # offset e prefissi delle stringhe: poche decine di KB, copiati in array
+        self._offsets = self._array("I", strings_offset, self._string_count + 1)
+        prefixes_offset = strings_offset + 4 * (self._string_count + 1)
+        self._prefix_ids = self._array("H", prefixes_offset, self._string_count)
+
+        self._text = prefixes_offset + 2 * self._string_count
+        self._text += -(self._text - strings_offset) % 4
+
+        self._strings: dict[int, str] = {}
+        self._index: dict[str, tuple[int, int]] = {}
+        for position in range(champ_count):
+            string_id, offset, size = INDEX_ENTRY.unpack_from(
+                self._map, index_offset + position * INDEX_ENTRY.size
+            )
+            self._index[self.string(string_id)] = (offset, size)
+
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def _array(self, typecode: str, offset: int, count: int) -> array:
+        values = array(typecode)
+        values.frombytes(self._map[offset : offset + values.itemsize * count])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def string(self, index: int) -> str:
+        """
+        Restituisce la stringa `index` della tabella (memorizzata dopo la prima lettura).
+        """
+
+        value = self._strings.get(index)
+        if value is None:
+            start = self._text + self._offsets[index]
+            end = self._text + self._offsets[index + 1]
+            value = self._prefixes[self._prefix_ids[index]] + self._map[
+                start:end
+            ].decode("utf-8")
+            self._strings[index] = value
+        return value
+
+    def _decode(self, value: Any) -> Any:
+        kind = type(value)
+        if kind is int:
+            return self.string(value)
+        if kind is dict:
+            return {self.string(key): self._decode(item) for key, item in value.items()}
+        if kind is list:
+            return [self._decode(item) for item in value]
+        if kind is msgspec.msgpack.Ext and value.code == INT_EXT:
+            return int.from_bytes(value.data, "little", signed=True)
+        return value
+
+    def keys(self) -> KeysView[str]:
+        return self._index.keys()
+
+    def __contains__(self, champ_id: str) -> bool:
+        return champ_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, champ_id: str) -> dict | None:
+        """
+        Restituisce i dati di un campione, o `None` se non presente.
+        """
+
+        entry = self._index.get(champ_id)
+        if entry is None:
+            return None
+
+        offset, size = entry
+        return self._decode(self._decoder.decode(self._map[offset : offset + size]))
+
+    def items(self) -> Iterator[tuple[str, dict]]:
+        for champ_id in self._index:
+            yield champ_id, self.get(champ_id)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "PackReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,208 @@
+from functools import lru_cache
+from html.entities import html5
+
+import re
+
+
+# ============================================
+# ========  DESCRIPTION SANITIZER  ===========
+# ============================================
+
+# Markup rimosso in un solo passaggio:
+# - blocchi `<script>` / `<style>` con il loro contenuto
+# - commenti `<!-- ... -->`, commenti impropri come `</ br>` e `</>`
+# - dichiarazioni / istruzioni `<!DOCTYPE ...>`, `<?...>`
+# - tag di apertura e chiusura (`<br>`, `<li>`, `<font color='...'>`, `</b>`, ...)
+#   con attributi tra virgolette che possono contenere `>`
+# Blocchi non chiusi (`<!--`, `<![CDATA[`, `<script>` senza fine, `<b` senza `>`, ...) finiscono in `incomplete`:
+# `html.parser` li tratta in modo diverso tra le versioni di Python.
+_MARKUP = re.compile(
+    r"""
+    <(script|style)\b(?:"[^"]*"|'[^']*'|[^'">])*>.*?</\1\s*>
+    | <!--.*?-->
+    | <(?:!(?!--|\[)|\?)[^>]*>
+    | </(?:[^a-zA-Z>][^>]*)?>
+    | <(?P<start>(?!(?:script|style)\b)[a-zA-Z][^\s/>]*)(?:"[^"]*"|'[^']*'|[^'">])*>
+    | </(?P<end>[a-zA-Z][^\s/>]*)(?:"[^"]*"|'[^']*'|[^'">])*>
+    | (?P<incomplete><[!?/a-zA-Z])
+    """,
+    re.VERBOSE | re.DOTALL | re.IGNORECASE,
+)
+
+
+# Elementi vuoti di `BeautifulSoup`: dopo `<br>` il primo `</br>` viene ignorato
+_VOID_TAGS = frozenset(
+    (
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+        "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+        "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+    )
+)  # fmt: skip
+
+# Spazi `ASCII` considerati da `html.parser` per i nodi di solo testo vuoto
+_ASCII_SPACES = " \n\t\f\r"
+
+# Riferimenti come li riconosce `html.parser` (con `convert_charrefs=False`, usato da `BeautifulSoup`):
+# il `;` finale è facoltativo ma serve un carattere di chiusura, altrimenti restano testo
+_CHARREF = re.compile(r"&#(?:[0-9]+|[xX][0-9a-fA-F]+)[^0-9a-fA-F]")
+_ENTITYREF = re.compile(r"&([a-zA-Z][-.a-zA-Z0-9]*)[^a-zA-Z0-9]")
+
+# Entità `HTML5` senza `;` (es. `amp`, `nbsp`): quelle sconosciute restano `&nome`
+_ENTITIES = {name.rstrip(";"): character for name, character in html5.items()}
+
+
+class _Irregular(ValueError):
+    """
+    Markup non chiuso o `&#` senza numero valido: `html.parser` li gestisce in modo irregolare.
+    """
+
+
+def _charref(number: int) -> str:
+    """
+    Restituisce il carattere di un riferimento numerico come `BeautifulSoup`.
+    """
+
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return "\ufffd"
+
+    # codici `C1` usati al posto della codifica Windows-1252 (es. `&#128;` -> `€`)
+    if 0x80 <= number <= 0x9F:
+        try:
+            return bytes((number,)).decode("cp1252")
+        except UnicodeDecodeError:
+            pass
+
+    return chr(number)
+
+
+def _unescape(data: str, final: bool) -> str:
+    """
+    Decodifica i riferimenti di un nodo di testo.
+
+    `final` indica se il testo chiude la descrizione: un riferimento che arriva alla fine senza
+    chiusura (es. `&amp`) resta invariato, mentre prima di un tag il `<` lo chiude.
+    """
+
+    if "&" not in data:
+        return data
+
+    # il `<` del markup successivo fa da carattere di chiusura
+    source = data if final else data + "<"
+
+    parts = []
+    position = 0
+    while (start := data.find("&", position)) >= 0:
+        parts.append(data[position:start])
+
+        if data.startswith("&#", start):
+            reference = _CHARREF.match(source, start)
+            if reference is None:
+                raise _Irregular(data)
+
+            name = reference.group()[2:-1]
+            number = int(name[1:], 16) if name[0] in "xX" else int(name)
+            parts.append(_charref(number))
+        else:
+            reference = _ENTITYREF.match(source, start)
+            if reference is None:
+                # `&x` in chiusura: `html.parser` scarta la `&`
+                if final and start == len(data) - 2 and data[-1].isascii():
+                    if data[-1].isalpha():
+                        position = start + 1
+                        continue
+
+                parts.append("&")
+                position = start + 1
+                continue
+
+            name = reference.group(1)
+            parts.append(_ENTITIES.get(name, f"&{name}"))
+
+        # il carattere di chiusura resta nel testo se non è `;`
+        position = reference.end()
+        if not reference.group().endswith(";"):
+            position -= 1
+
+    parts.append(data[position:])
+    return "".join(parts)
+
+
+def _text_node(text: str) -> str:
+    """
+    Come in `BeautifulSoup`, un nodo di soli spazi diventa `"\\n"` (se contiene un a capo) o `" "`.
+    """
+
+    if not text.strip(_ASCII_SPACES):
+        return "\n" if "\n" in text else " "
+    return text
+
+
+def _soup_text(description: str) -> str:
+    """
+    Riferimento per i casi non gestiti dal percorso veloce.
+    """
+
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(description, "html.parser").get_text()
+
+
+@lru_cache(maxsize=16384)
+def html_to_text(description: str) -> str:
+    """
+    Restituisce il testo di una descrizione `HTML` di Data Dragon.
+
+    Rimuove i tag (`<br>` e `<li>` inclusi, senza aggiungere separatori) e decodifica le entità,
+    con lo stesso risultato di `BeautifulSoup(description, "html.parser").get_text()`.
+
+    I risultati vengono memorizzati: le stesse descrizioni si ripetono spesso tra lingue e patch.
+    """
+
+    if not description:
+        return description
+
+    # Scansione unica: testo tra un blocco di markup e il successivo
+    parts = []
+    node = (
+        ""  # testo del nodo corrente, non interrotto da `</>` e da `</br>` dopo `<br>`
+    )
+    closed_voids: dict[str, int] = {}
+    position = 0
+    try:
+        for markup in _MARKUP.finditer(description):
+            start, end = markup.span()
+            kind = markup.lastgroup
+            if kind == "incomplete":
+                raise _Irregular(description)
+
+            if start > position:
+                node += _unescape(description[position:start], final=False)
+            position = end
+
+            if kind == "start":
+                tag = markup.group(kind).lower()
+                if tag in _VOID_TAGS and description[end - 2] != "/":
+                    closed_voids[tag] = closed_voids.get(tag, 0) + 1
+            elif kind == "end" and closed_voids:
+                tag = markup.group(kind).lower()
+                if closed_voids.get(tag):
+                    closed_voids[tag] -= 1
+                    continue
+            elif end - start == 3 and description[start:end] == "</>":
+                continue
+
+            if node:
+                parts.append(_text_node(node))
+                node = ""
+
+        if position < len(description):
+            node += _unescape(description[position:], final=True)
+
+    # casi rari, delegati a `BeautifulSoup`
+    except _Irregular:
+        return _soup_text(description)
+
+    if node:
+        parts.append(_text_node(node))
+
+    return "".join(parts)
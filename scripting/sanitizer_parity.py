@@ -0,0 +1,180 @@
+from json import loads
+from pathlib import Path
+from random import Random
+from typing import Iterable
+
+import sys
+
+from bs4 import BeautifulSoup
+
+from http_cache import CacheEntry, ResponseCache
+from sanitizer import html_to_text
+
+
+# ============================================
+# =========  SANITIZER PARITY CHECK  =========
+# ============================================
+
+# Verifica che `html_to_text` restituisca lo stesso testo di
+# `BeautifulSoup(description, "html.parser").get_text()`.
+#
+# Uso (dalla root del progetto):
+#
+#     python scripting/sanitizer_parity.py [numero di casi casuali]
+#
+# Termina con codice 1 e l'elenco delle differenze se almeno un caso diverge.
+
+DATA_PATH = Path("scripting/data")
+
+# Casi limite: tag malformati, entità senza `;` o sconosciute, spazi ripetuti
+EDGE_CASES = (
+    "",
+    "a</br>b",
+    "a</br >b",
+    "</ br>",
+    "a<br/>b<br />c",
+    "a<br>\n<br>b",
+    "x &amp y",
+    "x &amp; y",
+    "x &amp",
+    "&amp",
+    "&ampx",
+    "&amp-x",
+    "&amp<b>x</b>",
+    "&AMP; &Amp;",
+    "a&nbsp;&nbsp;b",
+    "a&nbsp",
+    "a&nbspb",
+    "&copy2023",
+    "foo &notit; bar",
+    "a&b;c",
+    "1 &lt 2 &gt; 0",
+    "&#39",
+    "&#39<br>",
+    "a &#39 b",
+    "&#x27; &#X27 ",
+    "&#65x &#65a",
+    "&#128512 &#128512;",
+    "&#0; &#1; &#128; &#x81; &#xD800; &#x110000;",
+    "a &# b",
+    "a &#",
+    "&#z; <b>x</b>",
+    "a &",
+    "a < b <3",
+    "  ",
+    " \n ",
+    "a  \n  b",
+    "a\n\n\nb",
+    "<b> </b>",
+    "<b>  </b>  <i> </i>",
+    "<br>  <br>",
+    "&#32;&#32;<br>&#10;",
+    "<p>a</p>\n\n<p>b</p>",
+    "x</p>",
+    "a</>b",
+    "a<!-- nota -->  <!-- > -->b",
+    "<!DOCTYPE html>a<?xml x?>b",
+    "<script>var a = '<b>';</script>a<style>b{}</style>",
+    "<font color='#FF9900'>x > y</font>",
+)
+
+# Descrizioni nello stile di Data Dragon (abilità e tooltip)
+TOOLTIPS = (
+    "Aatrox colpisce con la spada, infliggendo <physicalDamage>{{ qdamage }} danni fisici</physicalDamage>.<br><br>Può essere rilanciata altre <recast>2</recast> volte.",
+    "<mainText><stats><attention>25</attention> Armatura<br><attention>15%</attention> Velocità d'attacco</stats><br><br><passive>Passiva:</passive> bonus del 10%&nbsp;per 3 secondi.</mainText>",
+    "<li>Primo colpo</li><li>Secondo colpo</li><font color='#FFF673'>Costo: 50 mana</font>",
+    "Infligge danni magici pari al 4% (+1% ogni 100 PA) della salute massima del bersaglio.<br /><rules>Non può essere ridotto sotto 0.</rules>",
+)
+
+
+def bundled_descriptions() -> Iterable[str]:
+    """
+    Testi già esportati in `data/champ` (nomi, abilità e skin).
+    """
+
+    for path in sorted((DATA_PATH / "champ").glob("*_data.json")):
+        for champ in loads(path.read_text(encoding="utf-8")).values():
+            yield champ["name"]
+            yield champ["nickname"]
+            for ability in champ["abilities"].values():
+                yield ability["name"]
+                yield ability["description"]
+            for skin in champ["skins"].values():
+                yield skin["name"]
+
+
+def cached_descriptions() -> Iterable[str]:
+    """
+    Descrizioni `HTML` originali (lore, abilità, tooltip) dei `JSON` dettagliati nella cache HTTP.
+    """
+
+    folder = DATA_PATH / "cache"
+    if not (folder / "entries").exists():
+        return
+
+    cache = ResponseCache(folder)
+    for entry_path in sorted((folder / "entries").glob("*.json")):
+        entry = CacheEntry(**loads(entry_path.read_text(encoding="utf-8")))
+        if "/champion/" not in entry.url:
+            continue
+
+        body = cache.read(entry)
+        if body is None:
+            continue
+
+        for champ in loads(body)["data"].values():
+            yield champ.get("lore", "")
+            yield champ.get("blurb", "")
+            yield champ["passive"]["description"]
+            for spell in champ["spells"]:
+                yield spell["description"]
+                yield spell.get("tooltip", "")
+
+
+def random_descriptions(count: int, seed: int = 0) -> Iterable[str]:
+    """
+    Combinazioni casuali di frammenti di testo, tag ed entità.
+    """
+
+    fragments = (
+        "a", "b", " ", "  ", "\n", "\t", "<", ">", ";", "&", "#", "x", "1", "9",
+        "&amp", "&amp;", "&nbsp", "&lt;", "&#39", "&#x27;", "&#65", "&copy", "&foo;",
+        "<br>", "</br>", "<br/>", "<b>", "</b>", "<li>", "</li>", "</>", "<!--",
+        "-->", "<!DOCTYPE x>", "<?pi>", "<![CDATA[", "]]>", "<script>", "</script>",
+        "</ x>", "<font color='#FF0000'>", "</font>", "<stats>", "</stats>", "é",
+    )  # fmt: skip
+
+    generator = Random(seed)
+    for _ in range(count):
+        yield "".join(generator.choices(fragments, k=generator.randint(1, 12)))
+
+
+def main(random_count: int = 20000) -> int:
+    sources = {
+        "casi limite": EDGE_CASES,
+        "tooltip": TOOLTIPS,
+        "dati esportati": tuple(bundled_descriptions()),
+        "cache HTTP": tuple(cached_descriptions()),
+        "casuali": tuple(random_descriptions(random_count)),
+    }
+
+    failures = 0
+    for source, descriptions in sources.items():
+        diverging = 0
+        for description in descriptions:
+            expected = BeautifulSoup(description, "html.parser").get_text()
+            actual = html_to_text(description)
+
+            if actual != expected:
+                diverging += 1
+                print(f"❌ {description!r}: {actual!r} != {expected!r}")
+
+        failures += diverging
+        print(f"ℹ️ {source}: {len(descriptions)} casi, {diverging} differenze.")
+
+    print("✅ Nessuna differenza." if not failures else f"⚠️ {failures} differenze.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,211 @@
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import logging
+import random
+import threading
+import time
+
+import requests
+
+
+# ============================================
+# ===========  REQUEST SCHEDULER  ============
+# ============================================
+
+
+class TokenBucket:
+    """
+    Limita le richieste verso un host a `rate` al secondo, con raffiche fino a `burst`.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._capacity = max(1, burst)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Consuma un token, attendendo se necessario. Restituisce i secondi di attesa.
+        """
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                delay = (1 - self._tokens) / self._rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class RequestStats:
+    """
+    Contatori delle richieste eseguite dallo scheduler.
+
+    `wasted_time` somma la durata dei tentativi falliti e le attese di backoff,
+    `throttled_time` le attese imposte dal limite per host.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    throttled_time: float = 0.0
+    backoff_time: float = 0.0
+    wasted_time: float = 0.0
+
+
+class RequestScheduler:
+    """
+    Esegue le richieste HTTP della sessione con timeout, retry e limite di frequenza per host.
+
+    I tentativi falliti per timeout, errori di connessione o status in `RETRY_STATUSES` vengono
+    ripetuti fino a `max_retries` volte con backoff esponenziale e jitter (o rispettando `Retry-After`).
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        session: requests.Session,
+        logger: logging.Logger,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        rate_limit: float = 100.0,
+        burst: int = 50,
+    ):
+        self._session = session
+        self._logger = logger
+        self._timeout = (connect_timeout, read_timeout)
+        self._max_retries = max(0, max_retries)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._rate_limit = rate_limit
+        self._burst = burst
+
+        # host -> bucket, creati alla prima richiesta
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats = RequestStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> RequestStats:
+        """
+        Copia dei contatori correnti.
+        """
+
+        with self._lock:
+            return replace(self._stats)
+
+    def _count(self, **increments: float) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self._stats, name, getattr(self._stats, name) + value)
+
+    def _throttle(self, url: str) -> None:
+        """
+        Attende il turno della richiesta secondo il limite dell'host di `url`.
+        """
+
+        if not self._rate_limit:
+            return
+
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(
+                    self._rate_limit, self._burst
+                )
+
+        waited = bucket.acquire()
+        if waited:
+            self._count(throttled_time=waited)
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        """
+        Restituisce l'attesa prima del prossimo tentativo.
+
+        Usa `Retry-After` se presente, altrimenti backoff esponenziale con full jitter.
+        """
+
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        if retry_after:
+            try:
+                return min(self._backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    date = parsedate_to_datetime(retry_after)
+                    delay = (date - datetime.now(timezone.utc)).total_seconds()
+                    return min(self._backoff_max, max(0.0, delay))
+                except (TypeError, ValueError):
+                    pass
+
+        return random.uniform(
+            0, min(self._backoff_max, self._backoff_base * 2**attempt)
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Esegue la richiesta con retry; restituisce l'ultima risposta ottenuta.
+
+        Se tutti i tentativi falliscono per eccezione, l'ultima eccezione viene rilanciata.
+        """
+
+        kwargs.setdefault("timeout", self._timeout)
+
+        for attempt in range(self._max_retries + 1):
+            self._throttle(url)
+            self._count(requests=1)
+            started = time.monotonic()
+
+            try:
+                response = self._session.request(method, url, **kwargs)
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                elapsed = time.monotonic() - started
+                if attempt == self._max_retries:
+                    self._count(failures=1, wasted_time=elapsed)
+                    raise
+
+                reason, response = str(e), None
+
+            else:
+                if (
+                    response.status_code not in self.RETRY_STATUSES
+                    or attempt == self._max_retries
+                ):
+                    if response.status_code in self.RETRY_STATUSES:
+                        self._count(failures=1)
+                    return response
+
+                elapsed = time.monotonic() - started
+                reason = f"status {response.status_code}"
+                response.close()
+
+            delay = self._backoff(attempt, response)
+            self._logger.warning(
+                f"⚠️ Tentativo {attempt + 1} fallito ({reason}) verso: {url}, "
+                f"nuovo tentativo tra {delay:.2f}s"
+            )
+            time.sleep(delay)
+            self._count(retries=1, backoff_time=delay, wasted_time=elapsed + delay)
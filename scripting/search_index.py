@@ -0,0 +1,111 @@
+from typing import Iterable
+
+import re
+import unicodedata
+
+
+# ============================================
+# ==============  SEARCH INDEX  ==============
+# ============================================
+
+# Versione della normalizzazione, salvata nell'indice: il backend importa `normalize` da questo
+# modulo e rifiuta gli indici generati con una versione diversa
+NORMALIZATION = "nfkd-casefold-1"
+
+# Peso di ogni campo: un termine trovato nel nome conta più di uno nella descrizione
+FIELD_WEIGHTS = {
+    "name": 8,
+    "nickname": 4,
+    "ability": 2,
+    "description": 1,
+}
+
+_WORD = re.compile(r"\w+")
+
+# Consonanti finali Hangul (jongseong) -> consonanti iniziali (choseong) equivalenti:
+# mentre si scrive `아리` la sillaba `알` ha la `ㄹ` finale, nel nome completo è iniziale di `리`
+_HANGUL_FINALS = str.maketrans(
+    {
+        chr(code): "".join(
+            unicodedata.lookup(f"HANGUL CHOSEONG {part}")
+            for part in unicodedata.name(chr(code))
+            .removeprefix("HANGUL JONGSEONG ")
+            .split("-")
+        )
+        for code in range(0x11A8, 0x11C3)
+    }
+)
+
+
+def normalize(text: str) -> str:
+    """
+    Restituisce il testo in forma confrontabile per la ricerca.
+
+    - `NFKD` separa le lettere dagli accenti (`à` -> `a` + accento) e scompone le sillabe
+      Hangul nei loro jamo, così una sillaba ancora incompleta trova già i risultati
+      (le consonanti finali vengono uniformate a quelle iniziali);
+    - gli accenti (categoria `Mn`) vengono rimossi e le maiuscole uniformate con `casefold`.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    return (
+        "".join(char for char in decomposed if unicodedata.category(char) != "Mn")
+        .translate(_HANGUL_FINALS)
+        .casefold()
+    )
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Divide il testo normalizzato in parole.
+    """
+
+    return _WORD.findall(normalize(text))
+
+
+def _fields(champ: dict) -> Iterable[tuple[str, str]]:
+    """
+    Restituisce le coppie (campo, testo) indicizzate per un campione.
+    """
+
+    yield "name", champ["name"]
+    yield "nickname", champ["nickname"]
+    for ability in champ["abilities"].values():
+        yield "ability", ability["name"]
+        yield "description", ability["description"]
+
+
+def build_search_index(champions: dict) -> dict:
+    """
+    Costruisce l'indice invertito dei campioni: termine -> [(documento, peso), ...].
+
+    Per ogni termine e campione viene tenuto il peso del campo migliore in cui compare.
+    Nomi e nickname vengono indicizzati anche senza separatori (`Kai'Sa` -> `kaisa`).
+    I termini sono ordinati, per permettere la ricerca per prefisso con una ricerca binaria.
+    """
+
+    docs = []
+    postings: dict[str, dict[int, int]] = {}
+
+    for doc, (champ_id, champ) in enumerate(champions.items()):
+        docs.append((champ_id, champ["name"]))
+
+        for field, text in _fields(champ):
+            if not text:
+                continue
+
+            weight = FIELD_WEIGHTS[field]
+            terms = tokenize(text)
+            if field in ("name", "nickname") and len(terms) > 1:
+                terms.append("".join(terms))
+
+            for term in terms:
+                entry = postings.setdefault(term, {})
+                if entry.get(doc, 0) < weight:
+                    entry[doc] = weight
+
+    return {
+        "normalization": NORMALIZATION,
+        "docs": docs,
+        "terms": [(term, sorted(postings[term].items())) for term in sorted(postings)],
+    }